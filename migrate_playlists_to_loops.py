@@ -12,10 +12,14 @@ Run this script once before deploying the new InkyPi version.
 """
 
 import json
+import shutil
 import sys
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+from utils.atomic_json import atomic_write_json
+
 def migrate_playlist_to_loop(playlist_data):
     """Convert a playlist dict to a loop dict."""
     loop = {
@@ -62,11 +66,10 @@ def migrate_config(config_path):
         print("✓ Config already migrated (no playlist_config or display_mode found)")
         return False
 
-    # Backup original config
+    # Backup original config (byte-for-byte copy, no re-serialization)
     backup_path = config_path.with_suffix('.json.backup')
     print(f"Creating backup at: {backup_path}")
-    with open(backup_path, 'w') as f:
-        json.dump(config, f, indent=4)
+    shutil.copyfile(config_path, backup_path)
 
     # Migrate playlist_config to loop_config
     if "playlist_config" in config:
@@ -124,8 +127,7 @@ def migrate_config(config_path):
 
     # Write updated config
     print(f"Writing migrated config to: {config_path}")
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=4)
+    atomic_write_json(config_path, config, indent=True)
 
     print("✓ Migration complete!")
     return True
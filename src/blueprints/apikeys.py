@@ -8,11 +8,12 @@ import tempfile
 logger = logging.getLogger(__name__)
 apikeys_bp = Blueprint("apikeys", __name__)
 
-# Path to .env file
+# Path to .env file in the project root
+ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
+
 def get_env_path():
     """Get path to .env file in the project root."""
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-    return os.path.join(base_dir, '.env')
+    return ENV_PATH
 
 
 def parse_env_file(filepath):
@@ -1,12 +1,45 @@
 from flask import Blueprint, request, jsonify, current_app, render_template
 from utils.time_utils import calculate_seconds
-from utils.http_client import get_http_session
+from utils.http_client import get_http_session, GEOCODING_BASE_URL
+from refresh_task import LoopRefresh
+from collections import OrderedDict
 import logging
+import threading
+import time
 import requests  # Still needed for exception handling
 
 logger = logging.getLogger(__name__)
 loops_bp = Blueprint("loops", __name__)
 
+# In-process LRU cache of geocoding results: normalized city name -> (fetched_at, results)
+GEOCODE_CACHE_TTL_SECONDS = 3600
+GEOCODE_CACHE_MAX_ENTRIES = 256
+_geocode_cache = OrderedDict()
+_geocode_cache_lock = threading.Lock()
+
+
+def _get_cached_geocode(key):
+    """Returns cached geocoding results for key, or None if missing or expired."""
+    with _geocode_cache_lock:
+        entry = _geocode_cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, results = entry
+        if time.monotonic() - fetched_at >= GEOCODE_CACHE_TTL_SECONDS:
+            del _geocode_cache[key]
+            return None
+        _geocode_cache.move_to_end(key)
+        return results
+
+
+def _store_cached_geocode(key, results):
+    """Stores geocoding results for key, evicting the least recently used entry if full."""
+    with _geocode_cache_lock:
+        _geocode_cache[key] = (time.monotonic(), results)
+        _geocode_cache.move_to_end(key)
+        while len(_geocode_cache) > GEOCODE_CACHE_MAX_ENTRIES:
+            _geocode_cache.popitem(last=False)
+
 @loops_bp.route('/loops')
 def loops_page():
     """Main loops configuration page"""
@@ -22,7 +55,7 @@ def loops_page():
         'loops.html',
         loop_config=loop_manager.to_dict(),
         refresh_info=refresh_info.to_dict(),
-        plugins={p["id"]: p for p in plugins_list},
+        plugins=device_config.get_plugin_index(),
         all_plugins=plugins_list,
         loop_override=loop_override
     )
@@ -33,7 +66,7 @@ def create_loop():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     name = data.get("name")
     start_time = data.get("start_time")
     end_time = data.get("end_time")
@@ -45,7 +78,7 @@ def create_loop():
     if not loop_manager.add_loop(name, start_time, end_time):
         return jsonify({"error": f"Loop '{name}' already exists"}), 400
 
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": f"Created loop '{name}'"})
 
@@ -55,7 +88,7 @@ def update_loop():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     old_name = data.get("old_name")
     new_name = data.get("new_name")
     start_time = data.get("start_time")
@@ -64,7 +97,7 @@ def update_loop():
     if not loop_manager.update_loop(old_name, new_name, start_time, end_time):
         return jsonify({"error": f"Loop '{old_name}' not found"}), 404
 
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": f"Updated loop '{new_name}'"})
 
@@ -74,14 +107,14 @@ def delete_loop():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
 
     if not loop_manager.get_loop(loop_name):
         return jsonify({"error": f"Loop '{loop_name}' not found"}), 404
 
     loop_manager.delete_loop(loop_name)
-    device_config.write_config()
+    device_config.flush_config()
 
     return jsonify({"success": True, "message": f"Deleted loop '{loop_name}'"})
 
@@ -91,7 +124,7 @@ def add_plugin_to_loop():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
     plugin_id = data.get("plugin_id")
     refresh_interval = data.get("refresh_interval_seconds")
@@ -106,16 +139,10 @@ def add_plugin_to_loop():
     if not plugin_config:
         return jsonify({"error": "Plugin not found"}), 404
 
-    if not loop.add_plugin(plugin_id, refresh_interval):
+    if not loop.add_plugin(plugin_id, refresh_interval, plugin_settings):
         return jsonify({"error": f"Plugin '{plugin_id}' already in loop"}), 400
 
-    # Add settings if provided
-    for plugin_ref in loop.plugin_order:
-        if plugin_ref.plugin_id == plugin_id:
-            plugin_ref.plugin_settings = plugin_settings
-            break
-
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": f"Added plugin to '{loop_name}'"})
 
@@ -125,7 +152,7 @@ def remove_plugin_from_loop():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
     plugin_id = data.get("plugin_id")
 
@@ -136,7 +163,7 @@ def remove_plugin_from_loop():
     if not loop.remove_plugin(plugin_id):
         return jsonify({"error": "Plugin not found in loop"}), 404
 
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": f"Removed plugin from '{loop_name}'"})
 
@@ -146,16 +173,19 @@ def reorder_plugins():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
     plugin_ids = data.get("plugin_ids")
 
+    if not isinstance(plugin_ids, list):
+        return jsonify({"error": "plugin_ids must be a list"}), 400
+
     loop = loop_manager.get_loop(loop_name)
     if not loop:
         return jsonify({"error": "Loop not found"}), 404
 
     loop.reorder_plugins(plugin_ids)
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": "Plugin order updated"})
 
@@ -165,7 +195,7 @@ def update_rotation_interval():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     interval = data.get("interval")
     unit = data.get("unit")
 
@@ -175,7 +205,7 @@ def update_rotation_interval():
     interval_seconds = calculate_seconds(int(interval), unit)
     loop_manager.rotation_interval_seconds = interval_seconds
 
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     # Signal refresh task to update timing
     refresh_task = current_app.config['REFRESH_TASK']
@@ -189,7 +219,7 @@ def update_plugin_settings():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
     plugin_id = data.get("plugin_id")
     plugin_settings = data.get("plugin_settings", {})
@@ -200,7 +230,7 @@ def update_plugin_settings():
         return jsonify({"error": "Loop not found"}), 404
 
     # Find and update plugin reference
-    plugin_ref = next((ref for ref in loop.plugin_order if ref.plugin_id == plugin_id), None)
+    plugin_ref = loop.get_plugin_ref(plugin_id)
     if not plugin_ref:
         return jsonify({"error": "Plugin not found in loop"}), 404
 
@@ -214,7 +244,7 @@ def update_plugin_settings():
     if refresh_interval:
         plugin_ref.refresh_interval_seconds = refresh_interval
 
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     return jsonify({"success": True, "message": "Plugin settings updated"})
 
@@ -224,7 +254,7 @@ def toggle_loop_randomize():
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
 
     loop = loop_manager.get_loop(loop_name)
@@ -233,7 +263,7 @@ def toggle_loop_randomize():
 
     # Toggle the randomize setting
     loop.randomize = not loop.randomize
-    device_config.write_config()
+    device_config.write_config_debounced()
 
     status = "Random" if loop.randomize else "Sequential"
     return jsonify({
@@ -245,26 +275,31 @@ def toggle_loop_randomize():
 @loops_bp.route('/search_city', methods=['POST'])
 def search_city():
     """Search for cities using geocoding API"""
-    data = request.json
+    data = request.get_json(silent=True) or {}
     city_name = data.get("city_name", "").strip()
 
     if not city_name:
         return jsonify({"error": "City name is required"}), 400
 
-    try:
-        # Use Open-Meteo geocoding API (free, no key needed)
-        session = get_http_session()
-        response = session.get(
-            "https://geocoding-api.open-meteo.com/v1/search",
-            params={"name": city_name, "count": 5, "language": "en", "format": "json"},
-            timeout=10
-        )
+    cache_key = city_name.lower()
 
-        if response.status_code != 200:
-            return jsonify({"error": "Geocoding service unavailable"}), 503
-
-        result = response.json()
-        results = result.get("results", [])
+    try:
+        results = _get_cached_geocode(cache_key)
+        if results is None:
+            # Use Open-Meteo geocoding API (free, no key needed)
+            session = get_http_session()
+            response = session.get(
+                f"{GEOCODING_BASE_URL}/v1/search",
+                params={"name": city_name, "count": 5, "language": "en", "format": "json"},
+                timeout=10
+            )
+
+            if response.status_code != 200:
+                return jsonify({"error": "Geocoding service unavailable"}), 503
+
+            result = response.json()
+            results = result.get("results", [])
+            _store_cached_geocode(cache_key, results)
 
         if not results:
             return jsonify({"error": f"No cities found matching '{city_name}'"}), 404
@@ -294,13 +329,11 @@ def refresh_plugin_now():
 
     Returns 202 Accepted immediately - the refresh happens asynchronously in the background.
     """
-    from refresh_task import LoopRefresh
-
     device_config = current_app.config['DEVICE_CONFIG']
     loop_manager = device_config.get_loop_manager()
     refresh_task = current_app.config['REFRESH_TASK']
 
-    data = request.json
+    data = request.get_json(silent=True) or {}
     loop_name = data.get("loop_name")
     plugin_id = data.get("plugin_id")
 
@@ -309,7 +342,7 @@ def refresh_plugin_now():
         return jsonify({"error": "Loop not found"}), 404
 
     # Find the plugin reference in the loop
-    plugin_ref = next((ref for ref in loop.plugin_order if ref.plugin_id == plugin_id), None)
+    plugin_ref = loop.get_plugin_ref(plugin_id)
     if not plugin_ref:
         return jsonify({"error": "Plugin not found in loop"}), 404
 
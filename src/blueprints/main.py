@@ -1,17 +1,78 @@
-from flask import Blueprint, request, jsonify, current_app, render_template, send_file
+from flask import Blueprint, request, jsonify, current_app, render_template, send_from_directory, Response
+from werkzeug.exceptions import NotFound
+from werkzeug.http import http_date
+from refresh_task import LoopRefresh
+from utils.json_utils import json_dumps
 import os
 import time
 import logging
+import functools
+import subprocess
+import psutil
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 main_bp = Blueprint("main", __name__)
 
+# VERSION file at the repository root
+VERSION_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'VERSION')
+
+# Directory holding current_image.png
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images')
+CURRENT_IMAGE_PATH = os.path.join(IMAGES_DIR, 'current_image.png')
+
+# How long a stat of current_image.png is reused; the UI polls every few seconds
+CURRENT_IMAGE_STAT_TTL = 0.5
+# (checked_at monotonic time, mtime in whole seconds or None if missing)
+_current_image_stat = (float('-inf'), None)
+
+# Headers for responses polled by the UI: always revalidate before reuse
+POLL_RESPONSE_HEADERS = {"Cache-Control": "no-cache"}
+
+# Fixed JSON bodies, serialized once at import
+SUCCESS_BODY = json_dumps({"success": True})
+IMAGE_NOT_FOUND_BODY = json_dumps({"error": "Image not found"})
+NO_REFRESH_TASK_BODY = json_dumps({"error": "Refresh task not running"})
+OVERRIDE_CLEARED_BODY = json_dumps({"success": True, "message": "Override cleared, resuming schedule"})
+
+def _json_body_response(body, status=200):
+    """Response for an already-serialized JSON body."""
+    return Response(body, status=status, mimetype='application/json')
+
+# How long /api/diagnostics reuses its last metrics snapshot
+DIAGNOSTICS_CACHE_TTL = 1.0
+# (collected_at monotonic time, metrics dict or None before the first poll)
+_diagnostics_cache = (float('-inf'), None)
+
+# Kept for the life of the process so cpu_percent() measures since the last poll
+_INKYPI_PROCESS = psutil.Process()
+
+# Raspberry Pi firmware exposes the throttle flags here (same value as vcgencmd)
+THROTTLED_SYSFS_PATH = '/sys/devices/platform/soc/soc:firmware/get_throttled'
+
+_BYTES_PER_GB = float(1 << 30)
+
+def _to_mb(num_bytes):
+    """Whole MiB, rounded to nearest, using integer ops."""
+    return (num_bytes + (1 << 19)) >> 20
+
+def _open_metric_fd(path):
+    """Open a sysfs/procfs file once; its contents are re-read with os.pread."""
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+# Long-lived descriptors for files polled by /api/diagnostics (None if absent)
+_THERMAL_FD = _open_metric_fd('/sys/class/thermal/thermal_zone0/temp')
+_WIRELESS_FD = _open_metric_fd('/proc/net/wireless')
+_THROTTLED_FD = _open_metric_fd(THROTTLED_SYSFS_PATH)
+
+@functools.lru_cache(maxsize=1)
 def get_version():
-    """Read version from VERSION file."""
-    version_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'VERSION')
+    """Read version from VERSION file. Cached: the file doesn't change while running."""
     try:
-        with open(version_file, 'r') as f:
+        with open(VERSION_FILE, 'r') as f:
             return f.read().strip()
     except Exception:
         return "2.0.0"
@@ -32,37 +93,57 @@ def display_page():
     """Fullscreen display view - shows just the current image with auto-refresh."""
     return render_template('display.html')
 
+def _get_current_image_mtime():
+    """Returns current_image.png's mtime in whole seconds, or None if it doesn't exist.
+
+    The stat result is reused for CURRENT_IMAGE_STAT_TTL seconds so bursts of
+    polls from several clients cost one syscall.
+    """
+    global _current_image_stat
+    now = time.monotonic()
+    checked_at, mtime = _current_image_stat
+    if now - checked_at >= CURRENT_IMAGE_STAT_TTL:
+        try:
+            mtime = int(os.stat(CURRENT_IMAGE_PATH).st_mtime)
+        except FileNotFoundError:
+            mtime = None
+        _current_image_stat = (now, mtime)
+    return mtime
+
+@functools.lru_cache(maxsize=4)
+def _http_date(mtime):
+    """Last-Modified value for an mtime; only a handful of distinct mtimes are live at once."""
+    return http_date(mtime)
+
 @main_bp.route('/api/current_image')
 def get_current_image():
-    """Serve current_image.png with conditional request support (If-Modified-Since)."""
-    image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images', 'current_image.png')
-    
-    if not os.path.exists(image_path):
-        return jsonify({"error": "Image not found"}), 404
-    
-    # Get the file's last modified time (truncate to seconds to match HTTP header precision)
-    file_mtime = int(os.path.getmtime(image_path))
-    last_modified = datetime.fromtimestamp(file_mtime)
-    
-    # Check If-Modified-Since header
-    if_modified_since = request.headers.get('If-Modified-Since')
-    if if_modified_since:
-        try:
-            # Parse the If-Modified-Since header
-            client_mtime = datetime.strptime(if_modified_since, '%a, %d %b %Y %H:%M:%S %Z')
-            client_mtime_seconds = int(client_mtime.timestamp())
-            
-            # Compare (both now in seconds, no sub-second precision)
-            if file_mtime <= client_mtime_seconds:
-                return '', 304
-        except (ValueError, AttributeError):
-            pass
-    
-    # Send the file with Last-Modified header
-    response = send_file(image_path, mimetype='image/png')
-    response.headers['Last-Modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
-    response.headers['Cache-Control'] = 'no-cache'
-    return response
+    """Serve current_image.png with conditional request support (If-Modified-Since/ETag).
+
+    Unchanged If-Modified-Since polls are answered from the cached stat without
+    opening the file. Otherwise Werkzeug sets Last-Modified and ETag from the
+    file's stat and answers matching conditional requests with 304.
+    """
+    file_mtime = _get_current_image_mtime()
+    if file_mtime is None:
+        return _json_body_response(IMAGE_NOT_FOUND_BODY, 404)
+
+    headers = request.headers
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since is not None and 'If-None-Match' not in headers:
+        last_modified = _http_date(file_mtime)
+        # Clients echo our Last-Modified back verbatim, so the string compare
+        # settles almost every poll without parsing the date
+        if if_modified_since == last_modified or (
+                request.if_modified_since is not None
+                and file_mtime <= request.if_modified_since.timestamp()):
+            # Werkzeug strips entity headers such as Last-Modified from a 304;
+            # Cache-Control keeps the client revalidating on every poll
+            return Response(status=304, headers=POLL_RESPONSE_HEADERS)
+
+    try:
+        return send_from_directory(IMAGES_DIR, 'current_image.png', mimetype='image/png')
+    except NotFound:
+        return _json_body_response(IMAGE_NOT_FOUND_BODY, 404)
 
 
 @main_bp.route('/api/plugin_order', methods=['POST'])
@@ -78,7 +159,7 @@ def save_plugin_order():
 
     device_config.set_plugin_order(order)
 
-    return jsonify({"success": True})
+    return _json_body_response(SUCCESS_BODY)
 
 @main_bp.route('/toggle_loop', methods=['POST'])
 def toggle_loop():
@@ -109,13 +190,11 @@ def toggle_loop():
 @main_bp.route('/api/skip_to_next', methods=['POST'])
 def skip_to_next():
     """Skip to the next plugin in the loop immediately."""
-    from refresh_task import LoopRefresh
-
     device_config = current_app.config['DEVICE_CONFIG']
     refresh_task = current_app.config.get('REFRESH_TASK')
 
     if not refresh_task or not refresh_task.running:
-        return jsonify({"error": "Refresh task not running"}), 503
+        return _json_body_response(NO_REFRESH_TASK_BODY, 503)
 
     try:
         loop_manager = device_config.get_loop_manager()
@@ -134,8 +213,7 @@ def skip_to_next():
         refresh_task.queue_manual_update(refresh_action)
 
         # Get display name for response
-        plugin_config = device_config.get_plugin(plugin_ref.plugin_id)
-        plugin_name = plugin_config.get("display_name", plugin_ref.plugin_id) if plugin_config else plugin_ref.plugin_id
+        plugin_name = device_config.get_plugin_display_name(plugin_ref.plugin_id)
 
         return jsonify({
             "success": True,
@@ -207,7 +285,7 @@ def clear_override():
         device_config.clear_loop_override()
         if refresh_task:
             refresh_task.signal_config_change()
-        return jsonify({"success": True, "message": "Override cleared, resuming schedule"})
+        return _json_body_response(OVERRIDE_CLEARED_BODY)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -218,7 +296,7 @@ def get_next_change_time():
     refresh_task = current_app.config.get('REFRESH_TASK')
 
     if not refresh_task or not refresh_task.running:
-        return jsonify({"error": "Refresh task not running"}), 503
+        return _json_body_response(NO_REFRESH_TASK_BODY, 503)
 
     # Get the rotation interval from loop manager
     loop_manager = device_config.get_loop_manager()
@@ -228,37 +306,31 @@ def get_next_change_time():
     refresh_info = device_config.get_refresh_info()
     last_refresh = refresh_info.get_refresh_datetime()
 
+    # Use last loop rotation time (not last refresh time) for countdown
+    # so that auto-refreshing plugins don't reset the countdown
+    last_rotation = getattr(refresh_task, 'last_loop_rotation_time', None)
+    last_rotation_monotonic = getattr(refresh_task, 'last_loop_rotation_monotonic', None)
+    last_change = last_rotation or last_refresh
+    now = datetime.now(last_change.tzinfo) if last_change else datetime.now()
+
     # Get current plugin display name
     current_plugin_id = refresh_info.plugin_id
-    current_plugin_name = "Unknown"
-    if current_plugin_id:
-        plugin_config = device_config.get_plugin(current_plugin_id)
-        if plugin_config:
-            current_plugin_name = plugin_config.get("display_name", current_plugin_id)
+    current_plugin_name = device_config.get_plugin_display_name(current_plugin_id, default="Unknown")
 
     # Determine next plugin from loop (uses pre-computed next for random mode)
     next_plugin_name = "Unknown"
-    loop = loop_manager.determine_active_loop(datetime.now(refresh_info.get_refresh_datetime().tzinfo) if last_refresh else datetime.now())
+    loop = loop_manager.determine_active_loop(now)
     if loop and loop.plugin_order:
         next_ref = loop.peek_next_plugin()
         if next_ref:
-            next_plugin_config = device_config.get_plugin(next_ref.plugin_id)
-            if next_plugin_config:
-                next_plugin_name = next_plugin_config.get("display_name", next_ref.plugin_id)
+            next_plugin_name = device_config.get_plugin_display_name(next_ref.plugin_id, default="Unknown")
 
-    # Use last loop rotation time (not last refresh time) for countdown
-    # so that auto-refreshing plugins don't reset the countdown
-    refresh_task = current_app.config.get('REFRESH_TASK')
-    last_rotation = getattr(refresh_task, 'last_loop_rotation_time', None) if refresh_task else None
-
-    if last_rotation:
-        now = datetime.now(last_rotation.tzinfo)
-        elapsed = (now - last_rotation).total_seconds()
+    if last_rotation_monotonic is not None:
+        elapsed = time.monotonic() - last_rotation_monotonic
         remaining = max(0, interval_seconds - elapsed)
-    elif last_refresh:
-        # Fallback to last refresh time if no rotation tracked yet
-        now = datetime.now(last_refresh.tzinfo)
-        elapsed = (now - last_refresh).total_seconds()
+    elif last_change:
+        # Rotation restored from config, or none tracked yet (then last refresh time)
+        elapsed = (now - last_change).total_seconds()
         remaining = max(0, interval_seconds - elapsed)
     else:
         # No refresh yet, assume full interval remaining
@@ -270,12 +342,23 @@ def get_next_change_time():
     # Get override info with display name
     loop_override = device_config.get_loop_override() if hasattr(device_config, 'get_loop_override') else None
     if loop_override and loop_override.get("type") == "plugin":
-        override_plugin = device_config.get_plugin(loop_override.get("plugin_id"))
-        if override_plugin:
+        override_plugin_id = loop_override.get("plugin_id")
+        if device_config.get_plugin(override_plugin_id):
             loop_override = dict(loop_override)  # Don't mutate config
-            loop_override["display_name"] = override_plugin.get("display_name", loop_override.get("plugin_id"))
-
-    return jsonify({
+            loop_override["display_name"] = device_config.get_plugin_display_name(override_plugin_id)
+
+    # Cheap validator over every field in the payload; lets repeat polls within
+    # the same second get a 304 without serializing the body again
+    override_key = tuple(sorted(loop_override.items())) if loop_override else None
+    etag = format(hash((loop_enabled, interval_seconds, int(remaining), current_plugin_id,
+                        current_plugin_name, next_plugin_name, override_key)) & 0xFFFFFFFFFFFFFFFF, 'x')
+    if request.if_none_match.contains(etag):
+        response = Response(status=304, headers=POLL_RESPONSE_HEADERS)
+        response.set_etag(etag)
+        return response
+
+    # Serialize directly instead of going through jsonify
+    body = json_dumps({
         "success": True,
         "loop_enabled": loop_enabled,
         "interval_seconds": interval_seconds,
@@ -286,23 +369,19 @@ def get_next_change_time():
         "next_plugin": next_plugin_name,
         "override": loop_override
     })
+    response = Response(body, mimetype='application/json', headers=POLL_RESPONSE_HEADERS)
+    response.set_etag(etag)
+    return response
 
 @main_bp.route('/api/weather_location')
 def get_weather_location():
     """Return the weather plugin's saved location for use as a default by other plugins."""
     device_config = current_app.config['DEVICE_CONFIG']
     try:
-        loop_manager = device_config.get_loop_manager()
-        for loop in loop_manager.loops:
-            for ref in loop.plugin_order:
-                if ref.plugin_id == "weather" and ref.plugin_settings:
-                    lat = ref.plugin_settings.get("latitude")
-                    lon = ref.plugin_settings.get("longitude")
-                    if lat is not None and lon is not None:
-                        return jsonify({"latitude": lat, "longitude": lon})
+        lat, lon = device_config.get_loop_manager().get_weather_location()
     except Exception:
-        pass
-    return jsonify({"latitude": None, "longitude": None})
+        lat, lon = None, None
+    return jsonify({"latitude": lat, "longitude": lon})
 
 @main_bp.route('/diagnostics')
 def diagnostics_page():
@@ -312,37 +391,44 @@ def diagnostics_page():
 @main_bp.route('/api/diagnostics')
 def get_diagnostics():
     """Return Pi system metrics for diagnostics panel."""
-    import psutil
+    global _diagnostics_cache
+    collected_at, cached_metrics = _diagnostics_cache
+    now = time.monotonic()
+    if cached_metrics is not None and now - collected_at < DIAGNOSTICS_CACHE_TTL:
+        return jsonify(cached_metrics)
+
     metrics = {}
     try:
-        # CPU
-        metrics["cpu_percent"] = psutil.cpu_percent(interval=0.5)
+        # CPU: non-blocking, measured since the previous poll. The very first
+        # call has no baseline, so take a short sample instead of returning 0.
+        if cached_metrics is None:
+            metrics["cpu_percent"] = psutil.cpu_percent(interval=0.1)
+        else:
+            metrics["cpu_percent"] = psutil.cpu_percent(interval=None)
         metrics["load_avg"] = list(os.getloadavg())
 
         # Memory
         mem = psutil.virtual_memory()
-        metrics["mem_total_mb"] = round(mem.total / 1024 / 1024)
-        metrics["mem_used_mb"] = round(mem.used / 1024 / 1024)
+        metrics["mem_total_mb"] = _to_mb(mem.total)
+        metrics["mem_used_mb"] = _to_mb(mem.used)
         metrics["mem_percent"] = mem.percent
         swap = psutil.swap_memory()
-        metrics["swap_used_mb"] = round(swap.used / 1024 / 1024)
-        metrics["swap_total_mb"] = round(swap.total / 1024 / 1024)
+        metrics["swap_used_mb"] = _to_mb(swap.used)
+        metrics["swap_total_mb"] = _to_mb(swap.total)
 
         # Disk
         disk = psutil.disk_usage('/')
-        metrics["disk_total_gb"] = round(disk.total / 1024 / 1024 / 1024, 1)
-        metrics["disk_used_gb"] = round(disk.used / 1024 / 1024 / 1024, 1)
+        metrics["disk_total_gb"] = round(disk.total / _BYTES_PER_GB, 1)
+        metrics["disk_used_gb"] = round(disk.used / _BYTES_PER_GB, 1)
         metrics["disk_percent"] = disk.percent
 
         # Temperature
         try:
-            temps = psutil.sensors_temperatures()
-            if 'cpu_thermal' in temps:
-                metrics["temp_c"] = temps['cpu_thermal'][0].current
+            if _THERMAL_FD is not None:
+                # thermal_zone0 is cpu_thermal on the Pi
+                metrics["temp_c"] = round(int(os.pread(_THERMAL_FD, 32, 0)) / 1000, 1)
             else:
-                # Fallback: read directly
-                with open('/sys/class/thermal/thermal_zone0/temp') as f:
-                    metrics["temp_c"] = round(int(f.read().strip()) / 1000, 1)
+                metrics["temp_c"] = psutil.sensors_temperatures()['cpu_thermal'][0].current
         except Exception:
             metrics["temp_c"] = None
 
@@ -351,9 +437,7 @@ def get_diagnostics():
 
         # Throttle status (Pi-specific)
         try:
-            import subprocess
-            result = subprocess.run(['vcgencmd', 'get_throttled'], capture_output=True, text=True, timeout=2)
-            throttled = result.stdout.strip().split('=')[-1]
+            throttled = _read_throttled()
             metrics["throttled"] = throttled
             # Decode common flags
             val = int(throttled, 16)
@@ -364,15 +448,18 @@ def get_diagnostics():
             metrics["throttled"] = None
 
         # WiFi signal strength
-        try:
-            with open('/proc/net/wireless') as f:
-                for line in f:
+        if _WIRELESS_FD is not None:
+            try:
+                for line in os.pread(_WIRELESS_FD, 4096, 0).decode().splitlines():
                     if 'wlan0' in line:
                         parts = line.split()
                         metrics["wifi_link_quality"] = int(float(parts[2]))
                         metrics["wifi_signal_dbm"] = int(float(parts[3]))
                         break
-        except Exception:
+            except Exception:
+                metrics["wifi_link_quality"] = None
+                metrics["wifi_signal_dbm"] = None
+        else:
             metrics["wifi_link_quality"] = None
             metrics["wifi_signal_dbm"] = None
 
@@ -386,29 +473,43 @@ def get_diagnostics():
 
         # InkyPi process stats
         try:
-            proc = psutil.Process()
-            metrics["inkypi_cpu"] = proc.cpu_percent(interval=0)
-            metrics["inkypi_mem_mb"] = round(proc.memory_info().rss / 1024 / 1024)
+            metrics["inkypi_cpu"] = _INKYPI_PROCESS.cpu_percent(interval=0)
+            metrics["inkypi_mem_mb"] = _to_mb(_INKYPI_PROCESS.memory_info().rss)
         except Exception:
             pass
 
-    except ImportError:
-        return jsonify({"error": "psutil not installed"}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    _diagnostics_cache = (now, metrics)
     return jsonify(metrics)
 
+def _read_throttled():
+    """Return the throttle flags as a hex string like '0x50005'.
+
+    Reads the firmware sysfs node when available and only falls back to
+    spawning vcgencmd on kernels that don't expose it.
+    """
+    if _THROTTLED_FD is not None:
+        try:
+            return f"0x{int(os.pread(_THROTTLED_FD, 32, 0), 16):x}"
+        except (OSError, ValueError):
+            pass
+    result = subprocess.run(['vcgencmd', 'get_throttled'], capture_output=True, text=True, timeout=2)
+    return result.stdout.strip().split('=')[-1]
+
+
+# Precomputed strings for the common sub-minute case of format_time()
+_SECONDS_STRINGS = tuple(f"{i}s" for i in range(60))
 
 def format_time(seconds):
     """Format seconds into human-readable time."""
+    if isinstance(seconds, int) and 0 <= seconds < 60:
+        return _SECONDS_STRINGS[seconds]
     if seconds < 60:
         return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        secs = seconds % 60
-        return f"{minutes}m {secs}s"
-    else:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        return f"{hours}h {minutes}m"
\ No newline at end of file
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m {secs}s"
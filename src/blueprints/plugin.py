@@ -1,14 +1,82 @@
 from flask import Blueprint, request, jsonify, current_app, render_template, send_from_directory
+from werkzeug.security import safe_join
 from plugins.plugin_registry import get_plugin_instance
 from utils.app_utils import resolve_path, handle_request_files, parse_form
 from refresh_task import ManualRefresh
-import json
 import os
+import time
 import logging
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 plugin_bp = Blueprint("plugin", __name__)
 
+PLUGINS_DIR = os.path.abspath(resolve_path("plugins"))
+# Browser cache lifetime (seconds) for files served from plugin directories
+PLUGIN_IMAGE_MAX_AGE = 24 * 3600
+
+# Ticker validation results, keyed by symbol: (fetched monotonic time, name or "" if invalid)
+TICKER_CACHE_TTL_SECONDS = 24 * 3600
+# Rejections expire sooner: a partial yfinance response or a transient failure
+# shouldn't block a real symbol for a whole day
+TICKER_INVALID_CACHE_TTL_SECONDS = 5 * 60
+TICKER_CACHE_MAX_ENTRIES = 512
+TICKER_LOOKUP_TIMEOUT_SECONDS = 10
+_ticker_cache = OrderedDict()
+_ticker_cache_lock = threading.Lock()
+# Runs yfinance lookups so a hung request can be abandoned after a timeout
+_ticker_lookup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ticker-lookup")
+
+
+def _get_cached_ticker_name(ticker):
+    """Returns the cached name for ticker ("" if known invalid), or None if missing or expired."""
+    with _ticker_cache_lock:
+        entry = _ticker_cache.get(ticker)
+        if entry is None:
+            return None
+        fetched_at, name = entry
+        ttl = TICKER_CACHE_TTL_SECONDS if name else TICKER_INVALID_CACHE_TTL_SECONDS
+        if time.monotonic() - fetched_at >= ttl:
+            del _ticker_cache[ticker]
+            return None
+        _ticker_cache.move_to_end(ticker)
+        return name
+
+
+def _store_cached_ticker_name(ticker, name):
+    """Stores a validation result for ticker, evicting the least recently used entry if full."""
+    with _ticker_cache_lock:
+        _ticker_cache[ticker] = (time.monotonic(), name)
+        _ticker_cache.move_to_end(ticker)
+        while len(_ticker_cache) > TICKER_CACHE_MAX_ENTRIES:
+            _ticker_cache.popitem(last=False)
+
+
+def _lookup_ticker_name(ticker):
+    """Asks Yahoo Finance for ticker's name; returns "" if it isn't a valid, priced symbol."""
+    import yfinance as yf
+    info = yf.Ticker(ticker).info
+    name = info.get("shortName") or info.get("longName")
+    if not name or info.get("regularMarketPrice") is None and info.get("currentPrice") is None:
+        return ""
+    return name
+
+# Plugins build their settings template params from static data only, so the
+# result is computed once per plugin; plugin_page overlays per-request fields
+_settings_template_cache = {}
+
+def _get_settings_template_params(plugin_config):
+    """Returns a fresh copy of the plugin's cached settings template params."""
+    plugin_id = plugin_config["id"]
+    params = _settings_template_cache.get(plugin_id)
+    if params is None:
+        params = get_plugin_instance(plugin_config).generate_settings_template()
+        _settings_template_cache[plugin_id] = params
+    return dict(params)
+
 @plugin_bp.route('/plugin/<plugin_id>')
 def plugin_page(plugin_id):
     device_config = current_app.config['DEVICE_CONFIG']
@@ -25,7 +93,7 @@ def plugin_page(plugin_id):
     if edit_mode and loop_name:
         loop = loop_manager.get_loop(loop_name)
         if loop:
-            plugin_ref = next((ref for ref in loop.plugin_order if ref.plugin_id == plugin_id), None)
+            plugin_ref = loop.get_plugin_ref(plugin_id)
             if plugin_ref:
                 existing_settings = plugin_ref.plugin_settings or {}
                 existing_refresh_interval = plugin_ref.refresh_interval_seconds
@@ -34,8 +102,7 @@ def plugin_page(plugin_id):
     plugin_config = device_config.get_plugin(plugin_id)
     if plugin_config:
         try:
-            plugin = get_plugin_instance(plugin_config)
-            template_params = plugin.generate_settings_template()
+            template_params = _get_settings_template_params(plugin_config)
 
             # Note: We no longer support editing plugin instances directly from the plugin page
             # Plugin settings are now managed through loops
@@ -80,33 +147,25 @@ def plugin_page(plugin_id):
     else:
         return "Plugin not found", 404
 
+@functools.lru_cache(maxsize=64)
+def _get_plugin_dir(plugin_id):
+    """Absolute directory for a plugin's files, or None if plugin_id isn't a single path component."""
+    plugin_dir = safe_join(PLUGINS_DIR, plugin_id)
+    if plugin_dir is None or os.path.normpath(plugin_dir) == PLUGINS_DIR:
+        return None
+    return plugin_dir
+
 @plugin_bp.route('/images/<plugin_id>/<path:filename>')
 def image(plugin_id, filename):
-    # Resolve plugins directory dynamically
-    plugins_dir = resolve_path("plugins")
-
-    # Construct the full path to the plugin's file
-    plugin_dir = os.path.join(plugins_dir, plugin_id)
-
-    # Security check to prevent directory traversal
-    safe_path = os.path.abspath(os.path.join(plugin_dir, filename))
-    if not safe_path.startswith(os.path.abspath(plugins_dir)):
+    abs_plugin_dir = _get_plugin_dir(plugin_id)
+    if abs_plugin_dir is None:
         return "Invalid path", 403
 
-    # Convert to absolute path for send_from_directory
-    abs_plugin_dir = os.path.abspath(plugin_dir)
-
-    # Check if the directory and file exist
-    if not os.path.isdir(abs_plugin_dir):
-        logger.error(f"Plugin directory not found: {abs_plugin_dir}")
-        return "Plugin directory not found", 404
-
-    if not os.path.isfile(safe_path):
-        logger.error(f"File not found: {safe_path}")
-        return "File not found", 404
-
-    # Serve the file from the plugin directory
-    return send_from_directory(abs_plugin_dir, filename)
+    # send_from_directory rejects paths escaping abs_plugin_dir and returns
+    # 404 for missing files, so no separate isdir/isfile checks are needed.
+    # Plugin files only change on update, so browsers may reuse them for a
+    # while and then revalidate against the ETag/Last-Modified it sets.
+    return send_from_directory(abs_plugin_dir, filename, max_age=PLUGIN_IMAGE_MAX_AGE)
 
 @plugin_bp.route('/upload_image', methods=['POST'])
 def upload_image():
@@ -335,20 +394,16 @@ def save_tickers():
     # Get current tickers to preserve name data
     current_tickers = device_config.get_config("stocks_saved_tickers", default=[])
 
-    # Build lookup of current ticker data
-    ticker_data = {}
-    for t in current_tickers:
-        if isinstance(t, dict):
-            ticker_data[t["symbol"]] = t
-        else:
-            ticker_data[t] = {"symbol": t, "name": t}
+    # Lookup of current ticker data; old string entries are converted only if kept
+    ticker_data = {(t["symbol"] if isinstance(t, dict) else t): t for t in current_tickers}
 
     # Reorder based on new_order, preserving ticker data
     reordered = []
     for symbol in new_order[:6]:
         symbol_upper = symbol.strip().upper() if isinstance(symbol, str) else symbol
-        if symbol_upper in ticker_data:
-            reordered.append(ticker_data[symbol_upper])
+        t = ticker_data.get(symbol_upper)
+        if t is not None:
+            reordered.append(t if isinstance(t, dict) else {"symbol": t, "name": t})
 
     device_config.update_value("stocks_saved_tickers", reordered, write=True)
     return jsonify({"success": True, "tickers": reordered})
@@ -401,15 +456,15 @@ def add_ticker():
     if len(saved_tickers) >= 6:
         return jsonify({"error": "Maximum 6 tickers allowed", "tickers": saved_tickers}), 400
 
-    # Validate ticker using yfinance
+    # Validate ticker using yfinance; results are cached since lookups take seconds
     try:
-        import yfinance as yf
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        name = _get_cached_ticker_name(ticker)
+        if name is None:
+            future = _ticker_lookup_executor.submit(_lookup_ticker_name, ticker)
+            name = future.result(timeout=TICKER_LOOKUP_TIMEOUT_SECONDS)
+            _store_cached_ticker_name(ticker, name)
 
-        # Check if we got valid data
-        name = info.get("shortName") or info.get("longName")
-        if not name or info.get("regularMarketPrice") is None and info.get("currentPrice") is None:
+        if not name:
             return jsonify({"error": f"'{ticker}' is not a valid ticker symbol"}), 400
 
         # Store as object with symbol and name
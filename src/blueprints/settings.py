@@ -4,7 +4,8 @@ import os
 import subprocess
 import pytz
 import logging
-import io
+import time
+import functools
 
 # Try to import cysystemd for journal reading (Linux only)
 try:
@@ -25,50 +26,63 @@ except ImportError:
 logger = logging.getLogger(__name__)
 settings_bp = Blueprint("settings", __name__)
 
+# Timezone names for the settings dropdown; fixed for the life of the process
+TIMEZONES = tuple(sorted(pytz.all_timezones_set))
+
+TIME_FORMATS = frozenset({"12h", "24h"})
+# (form field, default) for the float image adjustments in save_settings
+IMAGE_SETTING_FIELDS = (("saturation", "1.0"), ("brightness", "1.0"), ("sharpness", "1.0"), ("contrast", "1.0"))
+
+# Repository root (holds VERSION and .git)
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+VERSION_FILE = os.path.join(REPO_DIR, 'VERSION')
+
+# Journal lines are sent in batches so the response streams with bounded memory
+LOG_STREAM_BATCH_SIZE = 256
+LOG_TIMESTAMP_FORMAT = "%b %d %H:%M:%S"
+LOG_TIMESTAMP_UNKNOWN = "??? ?? ??:??:??"
+
+@functools.lru_cache(maxsize=1)
 def _get_version():
-    """Read version from VERSION file."""
-    version_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'VERSION')
+    """Read version from VERSION file. Cached: only apply_update() changes it, and it clears the cache."""
     try:
-        with open(version_file, 'r') as f:
+        with open(VERSION_FILE, 'r') as f:
             return f.read().strip()
     except Exception:
-        return "unknown"
+        # Same placeholder the update check and apply responses have always shown
+        return '?'
 
 @settings_bp.route('/settings')
 def settings_page():
     device_config = current_app.config['DEVICE_CONFIG']
-    timezones = sorted(pytz.all_timezones_set)
-    return render_template('settings.html', device_settings=device_config.get_config(), timezones=timezones)
+    return render_template('settings.html', device_settings=device_config.get_config(), timezones=TIMEZONES)
 
 @settings_bp.route('/save_settings', methods=['POST'])
 def save_settings():
     device_config = current_app.config['DEVICE_CONFIG']
 
     try:
-        form_data = request.form.to_dict()
+        form_data = request.form
 
         time_format = form_data.get("timeFormat")
         if not form_data.get("timezoneName"):
             return jsonify({"error": "Time Zone is required"}), 400
-        if not time_format or time_format not in ["12h", "24h"]:
+        if time_format not in TIME_FORMATS:
             return jsonify({"error": "Time format is required"}), 400
 
+        image_settings = {key: float(form_data.get(key, default)) for key, default in IMAGE_SETTING_FIELDS}
+        if "inky_saturation" in form_data:
+            image_settings["inky_saturation"] = float(form_data["inky_saturation"])
+
         settings = {
             "orientation": form_data.get("orientation"),
             "inverted_image": form_data.get("invertImage"),
             "log_system_stats": form_data.get("logSystemStats"),
             "show_plugin_icon": form_data.get("showPluginIcon"),
             "timezone": form_data.get("timezoneName"),
-            "time_format": form_data.get("timeFormat"),
-            "image_settings": {
-                "saturation": float(form_data.get("saturation", "1.0")),
-                "brightness": float(form_data.get("brightness", "1.0")),
-                "sharpness": float(form_data.get("sharpness", "1.0")),
-                "contrast": float(form_data.get("contrast", "1.0"))
-            }
+            "time_format": time_format,
+            "image_settings": image_settings
         }
-        if "inky_saturation" in form_data:
-            settings["image_settings"]["inky_saturation"] = float(form_data.get("inky_saturation", "0.5"))
         device_config.update_config(settings)
 
     except RuntimeError as e:
@@ -96,14 +110,10 @@ def shutdown():
 def check_for_updates():
     """Check if there are updates available on the remote repository."""
     try:
-        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        repo_dir = REPO_DIR
 
         # Read current local version
-        version_file = os.path.join(repo_dir, 'VERSION')
-        local_version = '?'
-        if os.path.isfile(version_file):
-            with open(version_file, 'r') as f:
-                local_version = f.read().strip()
+        local_version = _get_version()
 
         # Fetch latest from remote (non-destructive)
         result = subprocess.run(
@@ -116,40 +126,33 @@ def check_for_updates():
                 "local_version": local_version
             }), 500
 
-        # Compare local HEAD with remote
-        local_hash = subprocess.run(
-            ['git', 'rev-parse', 'HEAD'],
-            cwd=repo_dir, capture_output=True, text=True, timeout=10
-        ).stdout.strip()
-
-        remote_hash = subprocess.run(
-            ['git', 'rev-parse', 'origin/main'],
-            cwd=repo_dir, capture_output=True, text=True, timeout=10
-        ).stdout.strip()
-
-        # Read remote version
-        remote_version_result = subprocess.run(
-            ['git', 'show', 'origin/main:VERSION'],
-            cwd=repo_dir, capture_output=True, text=True, timeout=10
-        )
-        remote_version = remote_version_result.stdout.strip() if remote_version_result.returncode == 0 else '?'
-
-        # Count commits behind
-        behind_result = subprocess.run(
-            ['git', 'rev-list', '--count', f'HEAD..origin/main'],
+        # Compare local HEAD with remote (both hashes in one call)
+        hashes = subprocess.run(
+            ['git', 'rev-parse', 'HEAD', 'origin/main'],
             cwd=repo_dir, capture_output=True, text=True, timeout=10
-        )
-        commits_behind = int(behind_result.stdout.strip()) if behind_result.returncode == 0 else 0
+        ).stdout.split()
+        local_hash, remote_hash = (hashes + ['', ''])[:2]
 
-        # Get commit log of what's new
+        # Only inspect the remote when it has moved on
+        remote_version = local_version
+        commits_behind = 0
         changelog = []
-        if commits_behind > 0:
+        if local_hash != remote_hash:
+            remote_version_result = subprocess.run(
+                ['git', 'show', 'origin/main:VERSION'],
+                cwd=repo_dir, capture_output=True, text=True, timeout=10
+            )
+            remote_version = remote_version_result.stdout.strip() if remote_version_result.returncode == 0 else '?'
+
+            # One log call gives both the commits-behind count and the changelog
             log_result = subprocess.run(
-                ['git', 'log', '--oneline', f'HEAD..origin/main', '--max-count=20'],
+                ['git', 'log', '--format=%h %s', 'HEAD..origin/main'],
                 cwd=repo_dir, capture_output=True, text=True, timeout=10
             )
             if log_result.returncode == 0:
-                changelog = [line.strip() for line in log_result.stdout.strip().split('\n') if line.strip()]
+                commits = [line.strip() for line in log_result.stdout.splitlines() if line.strip()]
+                commits_behind = len(commits)
+                changelog = commits[:20]
 
         return jsonify({
             "update_available": local_hash != remote_hash,
@@ -172,7 +175,7 @@ def check_for_updates():
 def apply_update():
     """Pull latest code from remote and restart the service."""
     try:
-        repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        repo_dir = REPO_DIR
 
         # Stash any local changes (e.g., __pycache__, config edits)
         subprocess.run(
@@ -189,16 +192,15 @@ def apply_update():
             return jsonify({"error": f"Git reset failed: {result.stderr.strip()}"}), 500
 
         # Read the new version
-        version_file = os.path.join(repo_dir, 'VERSION')
-        new_version = '?'
-        if os.path.isfile(version_file):
-            with open(version_file, 'r') as f:
-                new_version = f.read().strip()
+        _get_version.cache_clear()
+        new_version = _get_version()
 
-        # Schedule a service restart (delayed so this response can be sent first)
+        # Schedule a service restart (delayed so this response can be sent first).
+        # systemd runs it from a transient timer, outside this service's cgroup.
         subprocess.Popen(
-            ['bash', '-c', 'sleep 2 && sudo systemctl restart inkypi'],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ['sudo', 'systemd-run', '--on-active=2s', 'systemctl', 'restart', 'inkypi'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            close_fds=True, start_new_session=True
         )
 
         return jsonify({
@@ -217,8 +219,6 @@ def apply_update():
 @settings_bp.route('/download-logs')
 def download_logs():
     try:
-        buffer = io.StringIO()
-        
         # Get 'hours' from query parameters, default to 2 if not provided or invalid
         hours_str = request.args.get('hours', '2')
         try:
@@ -229,37 +229,24 @@ def download_logs():
 
         if not JOURNAL_AVAILABLE:
             # Return a message when running in development mode without systemd
-            buffer.write(f"Log download not available in development mode (cysystemd not installed).\n")
-            buffer.write(f"Logs would normally show InkyPi service logs from the last {hours} hours.\n")
-            buffer.write(f"\nTo see Flask development logs, check your terminal output.\n")
+            body = (
+                "Log download not available in development mode (cysystemd not installed).\n"
+                f"Logs would normally show InkyPi service logs from the last {hours} hours.\n"
+                "\nTo see Flask development logs, check your terminal output.\n"
+            )
         else:
+            # Open the journal up front so failures still produce a 500
             reader = JournalReader()
             reader.open(JournalOpenMode.SYSTEM)
             reader.add_filter(Rule("_SYSTEMD_UNIT", "inkypi.service"))
             reader.seek_realtime_usec(int(since.timestamp() * 1_000_000))
+            body = _iter_journal_lines(reader)
 
-            for record in reader:
-                try:
-                    ts = datetime.fromtimestamp(record.get_realtime_usec() / 1_000_000)
-                    formatted_ts = ts.strftime("%b %d %H:%M:%S")
-                except Exception:
-                    formatted_ts = "??? ?? ??:??:??"
-
-                data = record.data
-                hostname = data.get("_HOSTNAME", "unknown-host")
-                identifier = data.get("SYSLOG_IDENTIFIER") or data.get("_COMM", "?")
-                pid = data.get("_PID", "?")
-                msg = data.get("MESSAGE", "").rstrip()
-
-                # Format the log entry similar to the journalctl default output
-                buffer.write(f"{formatted_ts} {hostname} {identifier}[{pid}]: {msg}\n")
-
-        buffer.seek(0)
         # Add date and time to the filename
         now_str = datetime.now().strftime("%Y%m%d-%H%M%S")
         filename = f"inkypi_{now_str}.log"
         return Response(
-            buffer.read(),
+            body,
             mimetype="text/plain",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -268,3 +255,41 @@ def download_logs():
         logger.error(f"Error reading logs: {e}")
         return Response(f"Error reading logs: {e}", status=500, mimetype="text/plain")
 
+def _iter_journal_lines(reader):
+    """Yield journal records formatted like journalctl's default output, in encoded batches."""
+    batch = []
+    # Bursts of records share a second, so the formatted timestamp is reused
+    last_second = None
+    formatted_ts = LOG_TIMESTAMP_UNKNOWN
+    try:
+        for record in reader:
+            try:
+                second = record.get_realtime_usec() // 1_000_000
+            except Exception:
+                second = None
+            if second is None:
+                formatted_ts = LOG_TIMESTAMP_UNKNOWN
+            elif second != last_second:
+                try:
+                    formatted_ts = time.strftime(LOG_TIMESTAMP_FORMAT, time.localtime(second))
+                except (TypeError, ValueError, OverflowError, OSError):
+                    formatted_ts = LOG_TIMESTAMP_UNKNOWN
+            last_second = second
+
+            data = record.data
+            hostname = data.get("_HOSTNAME", "unknown-host")
+            identifier = data.get("SYSLOG_IDENTIFIER") or data.get("_COMM", "?")
+            pid = data.get("_PID", "?")
+            msg = data.get("MESSAGE", "").rstrip()
+
+            batch.append(f"{formatted_ts} {hostname} {identifier}[{pid}]: {msg}\n")
+            if len(batch) >= LOG_STREAM_BATCH_SIZE:
+                yield "".join(batch).encode()
+                batch.clear()
+    except Exception as e:
+        # Headers are already sent; note the failure in the file itself
+        logger.error(f"Error reading logs: {e}")
+        batch.append(f"\nError reading logs: {e}\n")
+    if batch:
+        yield "".join(batch).encode()
+
@@ -1,10 +1,10 @@
 import os
-import json
 import logging
-import tempfile
 import threading
 from dotenv import load_dotenv
 from model import RefreshInfo, LoopManager
+from utils.atomic_json import atomic_write_bytes
+from utils.json_utils import json_loads, json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -21,67 +21,113 @@ class Config:
     # Directory path for storing plugin instance images
     plugin_image_dir = os.path.join(BASE_DIR, "static", "images", "plugins")
 
+    # Coalescing window for write_config_debounced()
+    WRITE_DEBOUNCE_SECONDS = 0.1
+
     def __init__(self):
         self._config_lock = threading.Lock()
+        self._write_timer_lock = threading.Lock()
+        self._write_timer = None
         self.config = self.read_config()
         self.plugins_list = self.read_plugins_list()
-        self.loop_manager = self.load_loop_manager()
-        self.refresh_info = self.load_refresh_info()
+        # Plugin id -> plugin-info lookup; plugins_list is fixed after startup
+        self._plugin_index = {p['id']: p for p in self.plugins_list}
+        self._plugin_display_names = {p['id']: p.get('display_name', p['id']) for p in self.plugins_list}
+        # Ordered plugin list, rebuilt only when plugin_order changes
+        self._ordered_plugins = None
+        # Model objects are built from the raw config on first access
+        self._model_lock = threading.Lock()
+        self._loop_manager = None
+        self._refresh_info = None
         # Load .env once at startup
         load_dotenv(override=True)
 
     def read_config(self):
         """Reads the device config JSON file and returns it as a dictionary."""
         logger.debug(f"Reading device config from {self.config_file}")
-        with open(self.config_file) as f:
-            config = json.load(f)
+        with open(self.config_file, 'rb') as f:
+            raw = f.read()
+        config = json_loads(raw)
+        # What is on disk now; write_config skips writes that would reproduce it
+        self._written_config = raw
 
-        logger.debug("Loaded config:\n%s", json.dumps(config, indent=3))
+        # Pretty-printing the whole config is only worth it when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded config:\n%s", json_dumps(config, indent=True).decode())
 
         return config
 
     def read_plugins_list(self):
         """Reads the plugin-info.json config JSON from each plugin folder. Excludes the base plugin."""
-        # Iterate over all plugin folders
+        # Iterate over all plugin folders; scandir reports directory-ness
+        # from the directory listing itself, without a stat per entry
+        plugins_dir = os.path.join(self.BASE_DIR, "plugins")
+        with os.scandir(plugins_dir) as entries:
+            plugin_paths = sorted(entry.path for entry in entries
+                                  if entry.name != "__pycache__" and entry.is_dir())
+
         plugins_list = []
-        for plugin in sorted(os.listdir(os.path.join(self.BASE_DIR, "plugins"))):
-            plugin_path = os.path.join(self.BASE_DIR, "plugins", plugin)
-            if os.path.isdir(plugin_path) and plugin != "__pycache__":
-                # Check if the plugin-info.json file exists
-                plugin_info_file = os.path.join(plugin_path, "plugin-info.json")
-                if os.path.isfile(plugin_info_file):
+        for plugin_path in plugin_paths:
+            # Plugins without a plugin-info.json file (e.g. base_plugin) are skipped
+            plugin_info_file = os.path.join(plugin_path, "plugin-info.json")
+            try:
+                with open(plugin_info_file, 'rb') as f:
                     logger.debug(f"Reading plugin info from {plugin_info_file}")
-                    with open(plugin_info_file) as f:
-                        plugin_info = json.load(f)
-                    plugins_list.append(plugin_info)
+                    plugin_info = json_loads(f.read())
+            except FileNotFoundError:
+                continue
+            plugins_list.append(plugin_info)
 
         return plugins_list
 
     def write_config(self):
         """Updates the cached config from the model objects and writes to the config file atomically.
 
-        Uses atomic write pattern (write to temp file, then rename) to prevent
+        Uses atomic write pattern (fsynced temp file, then rename) to prevent
         config corruption if power is lost during write. Thread-safe via _config_lock.
         """
         with self._config_lock:
             logger.debug(f"Writing device config to {self.config_file}")
-            self.update_value("loop_config", self.loop_manager.to_dict())
-            self.update_value("refresh_info", self.refresh_info.to_dict())
+            # Models that were never loaded can't have changed; keep their raw config
+            if self._loop_manager is not None:
+                self.update_value("loop_config", self._loop_manager.to_dict())
+            if self._refresh_info is not None:
+                self.update_value("refresh_info", self._refresh_info.to_dict())
+
+            data = json_dumps(self.config, indent=True)
+            if data == self._written_config:
+                logger.debug("Device config unchanged, skipping write")
+                return
 
-            # Atomic write: write to temp file first, then rename
-            config_dir = os.path.dirname(self.config_file)
             try:
-                with tempfile.NamedTemporaryFile(mode='w', dir=config_dir,
-                                                  suffix='.tmp', delete=False) as tmp_file:
-                    json.dump(self.config, tmp_file, indent=4)
-                    tmp_path = tmp_file.name
-                # Atomic rename (on POSIX systems)
-                os.replace(tmp_path, self.config_file)
+                atomic_write_bytes(self.config_file, data)
             except Exception as e:
                 logger.error(f"Failed to write config atomically: {e}")
                 # Fallback to direct write if atomic fails
-                with open(self.config_file, 'w') as outfile:
-                    json.dump(self.config, outfile, indent=4)
+                self._written_config = None
+                with open(self.config_file, 'wb') as outfile:
+                    outfile.write(data)
+            self._written_config = data
+
+    def write_config_debounced(self):
+        """Schedules a config write, coalescing a burst of mutations into a single disk write.
+
+        The write happens WRITE_DEBOUNCE_SECONDS after the first call; further calls
+        within that window share it. Use flush_config() to force pending changes out.
+        """
+        with self._write_timer_lock:
+            if self._write_timer is None:
+                self._write_timer = threading.Timer(self.WRITE_DEBOUNCE_SECONDS, self.flush_config)
+                self._write_timer.daemon = True
+                self._write_timer.start()
+
+    def flush_config(self):
+        """Cancels any pending debounced write and writes the config to disk now."""
+        with self._write_timer_lock:
+            timer, self._write_timer = self._write_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.write_config()
 
     def get_config(self, key=None, default=None):
         """Gets the value of a specific configuration key or returns the entire config if none provided."""
@@ -91,24 +137,23 @@ class Config:
 
     def get_plugins(self):
         """Returns the list of plugin configurations, sorted by custom order if set."""
+        if self._ordered_plugins is None:
+            self._ordered_plugins = self._build_ordered_plugins()
+        return self._ordered_plugins
+
+    def _build_ordered_plugins(self):
+        """Builds the plugin list in the custom order from the config."""
         plugin_order = self.config.get('plugin_order', [])
 
         if not plugin_order:
             return self.plugins_list
 
-        # Create a dict for quick lookup
-        plugins_dict = {p['id']: p for p in self.plugins_list}
-
-        # Build ordered list
-        ordered = []
-        for plugin_id in plugin_order:
-            if plugin_id in plugins_dict:
-                ordered.append(plugins_dict.pop(plugin_id))
-
-        # Append any remaining plugins not in the order (new plugins)
-        ordered.extend(plugins_dict.values())
-
-        return ordered
+        # Ordered ids first (deduplicated, unknown ids dropped), then any
+        # remaining plugins (e.g. newly installed) in plugins_list order
+        index = self._plugin_index
+        ordered_ids = list(dict.fromkeys(pid for pid in plugin_order if pid in index))
+        placed = set(ordered_ids)
+        return [index[pid] for pid in ordered_ids] + [p for p in self.plugins_list if p['id'] not in placed]
 
     def set_plugin_order(self, order):
         """Sets the custom plugin display order."""
@@ -116,7 +161,18 @@ class Config:
 
     def get_plugin(self, plugin_id):
         """Finds and returns a plugin config by its ID."""
-        return next((plugin for plugin in self.plugins_list if plugin['id'] == plugin_id), None)
+        return self._plugin_index.get(plugin_id)
+
+    def get_plugin_display_name(self, plugin_id, default=None):
+        """Returns a plugin's display name, or default (the plugin ID if None) for unknown plugins."""
+        name = self._plugin_display_names.get(plugin_id)
+        if name is None:
+            return plugin_id if default is None else default
+        return name
+
+    def get_plugin_index(self):
+        """Returns a dict mapping plugin ID to plugin config. Do not mutate."""
+        return self._plugin_index
 
     def get_resolution(self):
         """Returns the display resolution as a tuple (width, height) from the configuration."""
@@ -127,11 +183,15 @@ class Config:
     def update_config(self, config):
         """Updates the config with the new values provided and writes to the config file."""
         self.config.update(config)
+        if 'plugin_order' in config:
+            self._ordered_plugins = None
         self.write_config()
 
     def update_value(self, key, value, write=False):
         """Updates a specific key in the configuration with a new value and optionally writes it to the config file."""
         self.config[key] = value
+        if key == 'plugin_order':
+            self._ordered_plugins = None
         if write:
             self.write_config()
 
@@ -159,6 +219,19 @@ class Config:
         """Loads the refresh information from the config."""
         return RefreshInfo.from_dict(self.get_config("refresh_info"))
 
+    @property
+    def refresh_info(self):
+        """The RefreshInfo model, materialized from the config on first access."""
+        if self._refresh_info is None:
+            with self._model_lock:
+                if self._refresh_info is None:
+                    self._refresh_info = self.load_refresh_info()
+        return self._refresh_info
+
+    @refresh_info.setter
+    def refresh_info(self, refresh_info):
+        self._refresh_info = refresh_info
+
     def get_refresh_info(self):
         """Returns the refresh information."""
         return self.refresh_info
@@ -168,6 +241,15 @@ class Config:
         loop_config = self.get_config("loop_config", default={})
         return LoopManager.from_dict(loop_config)
 
+    @property
+    def loop_manager(self):
+        """The LoopManager model, materialized from the config on first access."""
+        if self._loop_manager is None:
+            with self._model_lock:
+                if self._loop_manager is None:
+                    self._loop_manager = self.load_loop_manager()
+        return self._loop_manager
+
     def get_loop_manager(self):
         """Returns the loop manager."""
         return self.loop_manager
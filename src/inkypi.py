@@ -16,13 +16,14 @@ from flask import Flask
 from config import Config
 from display.display_manager import DisplayManager
 from refresh_task import RefreshTask
-from blueprints.main import main_bp
+from blueprints.main import main_bp, get_version
 from blueprints.settings import settings_bp
 from blueprints.plugin import plugin_bp
 from blueprints.apikeys import apikeys_bp
 from blueprints.loops import loops_bp
 from jinja2 import ChoiceLoader, FileSystemLoader
 from plugins.plugin_registry import load_plugins
+from utils.json_provider import OrjsonProvider
 from waitress import serve
 
 
@@ -45,6 +46,7 @@ else:
     logger.info("Starting InkyPi in PRODUCTION mode on port 80")
 logging.getLogger('waitress.queue').setLevel(logging.ERROR)
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 template_dirs = [
    os.path.join(os.path.dirname(__file__), "templates"),    # Default template folder
    os.path.join(os.path.dirname(__file__), "plugins"),      # Plugin templates
@@ -75,7 +77,6 @@ app.register_blueprint(loops_bp)
 # Inject project_name and version into all templates
 @app.context_processor
 def inject_globals():
-    from blueprints.main import get_version
     return dict(project_name="InkyPi", version=get_version())
 
 # Register opener for HEIF/HEIC images
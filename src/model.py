@@ -2,6 +2,7 @@ import os
 import json
 import logging
 import random
+import sys
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -11,7 +12,7 @@ class RefreshInfo:
 
     Attributes:
         refresh_time (str): ISO-formatted time string of the refresh.
-        image_hash (int): SHA-256 hash of the image.
+        image_hash (str): Hex digest of the image thumbnail (see compute_image_hash).
         refresh_type (str): Refresh type ['Manual Update', 'Loop'].
         plugin_id (str): Plugin id of the refresh.
         loop (str): Loop name if refresh_type is 'Loop'.
@@ -53,7 +54,47 @@ class RefreshInfo:
             loop=data.get("loop")
         )
 
-class LoopManager:
+def _minutes_of_day(hhmm):
+    """Converts 'HH:MM' (including '24:00') to minutes since midnight."""
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def _intern(value):
+    """Interns identifier strings so equality checks and dict lookups hit the identity fast path."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class _DictCached:
+    """Mixin that caches to_dict() output until a public attribute is reassigned.
+
+    Subclasses implement _build_dict(). Assigning any attribute not starting with
+    an underscore drops the cache, as does _invalidate_dict_cache(), which is also
+    propagated to the owning object (PluginReference -> Loop -> LoopManager) so the
+    parent's cached dict never embeds a stale child. In-place mutations of lists
+    must call _invalidate_dict_cache() explicitly. Callers must not mutate the
+    returned dict.
+    """
+    _dict_cache = None
+    _owner = None
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            self._invalidate_dict_cache()
+
+    def _invalidate_dict_cache(self):
+        self._dict_cache = None
+        if self._owner is not None:
+            self._owner._invalidate_dict_cache()
+
+    def to_dict(self):
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+
+
+class LoopManager(_DictCached):
     """Manages multiple time-based loops as an alternative to playlists.
 
     Loop Mode provides a simplified approach where plugins rotate in a sequence
@@ -68,43 +109,95 @@ class LoopManager:
 
     def __init__(self, loops=None, rotation_interval_seconds=None, active_loop=None):
         """Initialize LoopManager with loops and rotation interval."""
+        # Bumped whenever loops are added, edited or removed; part of the active loop cache key
+        self._loops_version = 0
+
         self.loops = loops or []
         self.rotation_interval_seconds = rotation_interval_seconds or self.DEFAULT_ROTATION_INTERVAL
         self.active_loop = active_loop
 
-        # Cache for active loop determination to avoid repeated recalculation
-        self._cached_current_time = None
+        # Cache for active loop determination, keyed by (minute of day, _loops_version)
+        self._cached_active_key = None
         self._cached_active_loop = None
 
+        # (latitude, longitude) of the first located weather plugin; None until looked up
+        self._weather_location = None
+
+    def _invalidate_dict_cache(self):
+        # Any change to a loop or plugin reference propagates here
+        self._weather_location = None
+        super()._invalidate_dict_cache()
+
+    def get_weather_location(self):
+        """Returns (latitude, longitude) saved on the first weather plugin that has both, else (None, None)."""
+        if self._weather_location is None:
+            self._weather_location = self._find_weather_location()
+        return self._weather_location
+
+    def _find_weather_location(self):
+        for loop in self.loops:
+            for ref in loop.plugin_order:
+                if ref.plugin_id == "weather" and ref.plugin_settings:
+                    lat = ref.plugin_settings.get("latitude")
+                    lon = ref.plugin_settings.get("longitude")
+                    if lat is not None and lon is not None:
+                        return (lat, lon)
+        return (None, None)
+
+    @property
+    def loops(self):
+        return self._loops
+
+    @loops.setter
+    def loops(self, loops):
+        self._loops = loops
+        for loop in loops:
+            loop._owner = self
+        self._loops_changed()
+
+    def _loops_changed(self):
+        """Refresh name lookups and the active loop cache after loops are added, removed or edited.
+
+        Loops call this on their owner when their name, time window or plugin
+        membership changes, since only loops with plugins can be active.
+        """
+        self._reindex_loops()
+        self._loops_by_priority = None
+        self._loops_version += 1
+
+    def _reindex_loops(self):
+        """Rebuild the name -> Loop lookup from loops."""
+        # Reversed so the first loop wins if an old config has duplicate names
+        self._loop_by_name = {loop.name: loop for loop in reversed(self.loops)}
+
     def get_loop_names(self):
         """Returns a list of all loop names."""
         return [loop.name for loop in self.loops]
 
     def get_loop(self, loop_name):
         """Returns the loop with the specified name."""
-        return next((loop for loop in self.loops if loop.name == loop_name), None)
+        return self._loop_by_name.get(loop_name)
 
     def add_loop(self, name, start_time, end_time):
         """Creates and adds a new loop with the given time range."""
-        if self.get_loop(name):
+        if name in self._loop_by_name:
             logger.warning(f"Loop '{name}' already exists.")
             return False
-        self.loops.append(Loop(name, start_time, end_time))
-        # Invalidate cache since loops changed
-        self._cached_active_loop = None
+        loop = Loop(name, start_time, end_time)
+        loop._owner = self
+        self.loops.append(loop)
+        self._invalidate_dict_cache()
+        self._loops_changed()
         return True
 
     def update_loop(self, old_name, new_name, start_time, end_time):
         """Updates an existing loop's name and time range."""
         loop = self.get_loop(old_name)
         if loop:
+            # The Loop setters reset its cached window and notify this manager
             loop.name = new_name
             loop.start_time = start_time
             loop.end_time = end_time
-            # Invalidate cached time range since times changed
-            loop._cached_time_range_minutes = None
-            # Invalidate active loop cache since loop properties changed
-            self._cached_active_loop = None
             return True
         logger.warning(f"Loop '{old_name}' not found.")
         return False
@@ -112,8 +205,6 @@ class LoopManager:
     def delete_loop(self, name):
         """Deletes the loop with the specified name."""
         self.loops = [loop for loop in self.loops if loop.name != name]
-        # Invalidate cache since loops changed
-        self._cached_active_loop = None
 
     def determine_active_loop(self, current_datetime, override=None):
         """Determine the active loop based on the current time or override.
@@ -135,29 +226,36 @@ class LoopManager:
             elif override.get("type") == "plugin":
                 return None  # Plugin pin handled by refresh_task
 
-        current_time = current_datetime.strftime("%H:%M")
+        # Loop windows depend only on the minute of the day
+        current_minute = current_datetime.hour * 60 + current_datetime.minute
+        cache_key = (current_minute, self._loops_version)
 
-        # Return cached result if time hasn't changed
-        if self._cached_current_time == current_time and self._cached_active_loop is not None:
+        # Return cached result if neither the minute nor the loops have changed.
+        # The plugin check catches a loop emptied since the result was cached.
+        if self._cached_active_key == cache_key and self._cached_active_loop is not None \
+                and self._cached_active_loop.plugin_order:
             return self._cached_active_loop
 
-        # Get active loops that have plugins
-        active_loops = [loop for loop in self.loops if loop.is_active(current_time) and loop.plugin_order]
-        if not active_loops:
-            self._cached_current_time = current_time
-            self._cached_active_loop = None
-            return None
-
-        # Sort loops by priority (smallest time range first)
-        # Note: get_priority() now uses cached time_range_minutes
-        active_loops.sort(key=lambda l: l.get_priority())
+        # Highest priority (smallest time range) among active loops that have
+        # plugins: the first match in priority order
+        active_loop = next((loop for loop in self._get_loops_by_priority()
+                            if loop.is_active(current_minute) and loop.plugin_order), None)
 
         # Cache result
-        self._cached_current_time = current_time
-        self._cached_active_loop = active_loops[0]
-        return active_loops[0]
+        self._cached_active_key = cache_key
+        self._cached_active_loop = active_loop
+        return active_loop
 
-    def to_dict(self):
+    def _get_loops_by_priority(self):
+        """Loops ordered by priority, rebuilt only after loops change.
+
+        The sort is stable, so loops with equal time ranges keep their configured order.
+        """
+        if self._loops_by_priority is None:
+            self._loops_by_priority = tuple(sorted(self.loops, key=Loop.get_priority))
+        return self._loops_by_priority
+
+    def _build_dict(self):
         return {
             "loops": [loop.to_dict() for loop in self.loops],
             "rotation_interval_seconds": self.rotation_interval_seconds,
@@ -173,7 +271,7 @@ class LoopManager:
         )
 
 
-class Loop:
+class Loop(_DictCached):
     """Represents a single time-based loop for plugin rotation.
 
     A loop defines a time window during which a specific sequence of plugins
@@ -198,50 +296,115 @@ class Loop:
         self.randomize = randomize
         self.next_plugin_index = next_plugin_index  # Pre-computed next plugin
 
-        # Cache time range calculation to avoid repeated string parsing
-        self._cached_time_range_minutes = None
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = _intern(name)
+        if self._owner is not None:
+            self._owner._loops_changed()
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, start_time):
+        self._start_time = start_time
+        self._schedule_changed()
+
+    @property
+    def end_time(self):
+        return self._end_time
+
+    @end_time.setter
+    def end_time(self, end_time):
+        self._end_time = end_time
+        self._schedule_changed()
 
-    def is_active(self, current_time):
-        """Check if the loop is active at the given time."""
-        if self.start_time <= self.end_time:
+    def _schedule_changed(self):
+        # Time range and (start, end) minutes of day are parsed on first use
+        self._cached_time_range_minutes = None
+        self._cached_window_minutes = None
+        if self._owner is not None:
+            self._owner._loops_changed()
+
+    def _membership_changed(self):
+        # Adding or removing plugins can change which loop is active
+        if self._owner is not None:
+            self._owner._loops_changed()
+
+    @property
+    def plugin_order(self):
+        return self._plugin_order
+
+    @plugin_order.setter
+    def plugin_order(self, plugin_order):
+        self._plugin_order = plugin_order
+        for ref in plugin_order:
+            ref._owner = self
+        self._reindex_plugins()
+        self._membership_changed()
+
+    def _get_window_minutes(self):
+        if self._cached_window_minutes is None:
+            self._cached_window_minutes = (_minutes_of_day(self.start_time), _minutes_of_day(self.end_time))
+        return self._cached_window_minutes
+
+    def is_active(self, current_minute):
+        """Check if the loop is active at the given minute of the day (hour * 60 + minute)."""
+        start, end = self._get_window_minutes()
+        if start <= end:
             # Non-wrapping window (e.g., 09:00-15:00)
-            return self.start_time <= current_time < self.end_time
+            return start <= current_minute < end
         else:
             # Wrapping window across midnight (e.g., 21:00-03:00)
-            return current_time >= self.start_time or current_time < self.end_time
+            return current_minute >= start or current_minute < end
 
-    def add_plugin(self, plugin_id, refresh_interval_seconds):
+    def add_plugin(self, plugin_id, refresh_interval_seconds, plugin_settings=None):
         """Add a plugin to this loop's rotation."""
         # Check if plugin already exists in this loop
-        if any(ref.plugin_id == plugin_id for ref in self.plugin_order):
+        if plugin_id in self._plugin_by_id:
             logger.warning(f"Plugin '{plugin_id}' already exists in loop '{self.name}'.")
             return False
-        self.plugin_order.append(PluginReference(plugin_id, refresh_interval_seconds))
+        plugin_ref = PluginReference(plugin_id, refresh_interval_seconds, plugin_settings)
+        plugin_ref._owner = self
+        self.plugin_order.append(plugin_ref)
+        self._plugin_by_id[plugin_id] = plugin_ref
+        self._invalidate_dict_cache()
+        self._membership_changed()
         return True
 
     def remove_plugin(self, plugin_id):
         """Remove a plugin from this loop's rotation."""
-        initial_count = len(self.plugin_order)
-        self.plugin_order = [ref for ref in self.plugin_order if ref.plugin_id != plugin_id]
-
-        if len(self.plugin_order) == initial_count:
+        if plugin_id not in self._plugin_by_id:
             logger.warning(f"Plugin '{plugin_id}' not found in loop '{self.name}'.")
             return False
+
+        self.plugin_order = [ref for ref in self.plugin_order if ref.plugin_id != plugin_id]
         return True
 
     def reorder_plugins(self, plugin_ids):
         """Reorder plugins based on a list of plugin IDs."""
-        # Create a mapping of plugin_id to PluginReference
-        plugin_map = {ref.plugin_id: ref for ref in self.plugin_order}
-
         # Reorder based on provided IDs
         new_order = []
         for plugin_id in plugin_ids:
-            if plugin_id in plugin_map:
-                new_order.append(plugin_map[plugin_id])
+            if plugin_id in self._plugin_by_id:
+                new_order.append(self._plugin_by_id[plugin_id])
 
         self.plugin_order = new_order
 
+    def get_plugin_ref(self, plugin_id):
+        """Returns the PluginReference for plugin_id, or None if it is not in this loop."""
+        return self._plugin_by_id.get(plugin_id)
+
+    def _reindex_plugins(self):
+        """Rebuild the plugin_id -> PluginReference lookup from plugin_order."""
+        # Reversed so the first reference wins if an old config has duplicates
+        self._plugin_by_id = {ref.plugin_id: ref for ref in reversed(self.plugin_order)}
+
     def get_next_plugin(self):
         """Returns the next plugin reference in rotation.
 
@@ -276,11 +439,17 @@ class Loop:
 
         if self.randomize:
             # Random selection - avoid current plugin if possible
-            if len(self.plugin_order) == 1:
+            count = len(self.plugin_order)
+            current = self.current_plugin_index
+            if count == 1:
                 self.next_plugin_index = 0
+            elif current is not None and 0 <= current < count:
+                # Uniform over the other count - 1 indices: draw from a range
+                # one shorter and step over the current index
+                index = random.randrange(count - 1)
+                self.next_plugin_index = index + 1 if index >= current else index
             else:
-                available_indices = [i for i in range(len(self.plugin_order)) if i != self.current_plugin_index]
-                self.next_plugin_index = random.choice(available_indices)
+                self.next_plugin_index = random.randrange(count)
         else:
             # Sequential - next in order
             if self.current_plugin_index is None:
@@ -309,23 +478,15 @@ class Loop:
         if self._cached_time_range_minutes is not None:
             return self._cached_time_range_minutes
 
-        start = datetime.strptime(self.start_time, "%H:%M")
-
-        # Handle '24:00' by converting it to '00:00' of the next day
-        if self.end_time != "24:00":
-            end = datetime.strptime(self.end_time, "%H:%M")
-        else:
-            end = datetime.strptime("00:00", "%H:%M")
-            end += timedelta(days=1)
-
-        # If the window wraps past midnight (e.g., 21:00 -> 03:00), treat end as next day
+        # '24:00' parses to 1440; a window that wraps past midnight
+        # (e.g., 21:00 -> 03:00) ends on the next day
+        start, end = self._get_window_minutes()
         if end < start:
-            end += timedelta(days=1)
-
-        self._cached_time_range_minutes = int((end - start).total_seconds() // 60)
+            end += 24 * 60
+        self._cached_time_range_minutes = end - start
         return self._cached_time_range_minutes
 
-    def to_dict(self):
+    def _build_dict(self):
         return {
             "name": self.name,
             "start_time": self.start_time,
@@ -349,7 +510,7 @@ class Loop:
         )
 
 
-class PluginReference:
+class PluginReference(_DictCached):
     """Reference to a plugin with its refresh timing settings.
 
     Unlike PluginInstance, this is simplified - settings are optional and
@@ -361,9 +522,11 @@ class PluginReference:
         plugin_settings (dict): Optional settings for the plugin. If None/empty, plugin uses defaults.
         latest_refresh_time (str): ISO timestamp of last data refresh.
     """
+    _cached_latest_str = None
+    _cached_latest_dt = None
 
     def __init__(self, plugin_id, refresh_interval_seconds, plugin_settings=None, latest_refresh_time=None):
-        self.plugin_id = plugin_id
+        self.plugin_id = _intern(plugin_id)
         self.refresh_interval_seconds = refresh_interval_seconds
         self.plugin_settings = plugin_settings or {}
         self.latest_refresh_time = latest_refresh_time
@@ -377,12 +540,20 @@ class PluginReference:
         return (current_time - latest_refresh_dt) >= timedelta(seconds=self.refresh_interval_seconds)
 
     def get_latest_refresh_dt(self):
-        """Returns the latest refresh time as a datetime object, or None if not set."""
-        if self.latest_refresh_time:
-            return datetime.fromisoformat(self.latest_refresh_time)
-        return None
+        """Returns the latest refresh time as a datetime object, or None if not set.
 
-    def to_dict(self):
+        The parsed value is kept until latest_refresh_time changes, since the
+        refresh loop polls this far more often than the timestamp is updated.
+        """
+        latest_refresh_time = self.latest_refresh_time
+        if not latest_refresh_time:
+            return None
+        if latest_refresh_time != self._cached_latest_str:
+            self._cached_latest_dt = datetime.fromisoformat(latest_refresh_time)
+            self._cached_latest_str = latest_refresh_time
+        return self._cached_latest_dt
+
+    def _build_dict(self):
         return {
             "plugin_id": self.plugin_id,
             "refresh_interval_seconds": self.refresh_interval_seconds,
@@ -5,6 +5,10 @@ from io import BytesIO
 import base64
 import random
 import html
+import threading
+from functools import lru_cache
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from utils.http_client import get_http_session
 import logging
 
@@ -21,6 +25,9 @@ NEWS_FEEDS = {
     "verge": ("The Verge", "https://www.theverge.com/rss/index.xml"),
 }
 
+# Concurrent feed downloads; matches the shared HTTP session's connection pool size
+MAX_FEED_FETCH_WORKERS = 4
+
 # OpenAI models
 OPENAI_IMAGE_MODELS = ["dall-e-3", "dall-e-2", "gpt-image-1"]
 DEFAULT_OPENAI_MODEL = "dall-e-3"
@@ -29,6 +36,158 @@ DEFAULT_OPENAI_MODEL = "dall-e-3"
 GEMINI_IMAGE_MODELS = ["imagen-4.0-generate-001", "imagen-4.0-fast-generate-001", "imagen-4.0-ultra-generate-001"]
 DEFAULT_GEMINI_MODEL = "imagen-4.0-generate-001"
 
+# Title overlay font and padding around the text
+TITLE_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+TITLE_PADDING = 10
+TITLE_BAR_COLOR = (0, 0, 0, 180)
+
+# Validators and parsed headlines per feed URL, for conditional requests
+FEED_CACHE_MAX_ENTRIES = 32
+# Headlines read per feed; the newest items come first
+FEED_TITLE_LIMIT = 50
+# Feeds are downloaded in chunks up to this size; headlines are at the top
+MAX_FEED_BYTES = 2 * 1024 * 1024
+FEED_CHUNK_BYTES = 64 * 1024
+_feed_cache = {}
+_feed_cache_lock = threading.Lock()
+
+
+def _store_feed_headlines(url, etag, last_modified, headlines):
+    """Remember a feed's headlines if the server gave validators to revalidate them with."""
+    with _feed_cache_lock:
+        _feed_cache.pop(url, None)
+        if not (etag or last_modified):
+            return
+        _feed_cache[url] = {"etag": etag, "last_modified": last_modified, "headlines": tuple(headlines)}
+        # Dicts keep insertion order, so the first key is the least recently stored
+        while len(_feed_cache) > FEED_CACHE_MAX_ENTRIES:
+            del _feed_cache[next(iter(_feed_cache))]
+
+
+@lru_cache(maxsize=64)
+def _load_font(font_path, size):
+    """Loads a TrueType font once per (path, size); title overlays reuse the same few sizes."""
+    return ImageFont.truetype(font_path, size)
+
+
+@lru_cache(maxsize=4)
+def _sanitize_api_key(api_key):
+    """Strips non-ASCII characters and whitespace (fixes copy/paste issues with special characters)."""
+    return api_key.encode('ascii', errors='ignore').decode('ascii').strip()
+
+
+@lru_cache(maxsize=2)
+def _get_openai_client(api_key):
+    """Returns an OpenAI client per API key, so its connection pool is reused between images."""
+    return OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=2)
+def _get_gemini_client(api_key):
+    """Returns a Gemini client per API key. Raises ImportError if google-genai is missing."""
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+@lru_cache(maxsize=32)
+def _layout_title(title, width, height):
+    """Fits a title overlay to an image size.
+
+    Returns (display_title, font, text_x, bar_height). Cached because the
+    same headline or prompt is overlaid on every image of the same size.
+    """
+    draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    max_text_width = width - (TITLE_PADDING * 2)
+
+    # Start with a reasonable font size and scale down if needed
+    target_font_size = max(14, int(height * 0.03))
+
+    def measure(text, font):
+        bbox = draw.textbbox((0, 0), text, font=font)
+        return bbox[2] - bbox[0]
+
+    try:
+        font = _load_font(TITLE_FONT_PATH, target_font_size)
+    except Exception:
+        font = ImageFont.load_default()
+    else:
+        # Text width grows with font size, so binary-search the largest
+        # size from 10 up that fits; 10 is used even if nothing fits
+        if measure(title, font) > max_text_width:
+            low, high = 10, target_font_size - 1
+            while low < high:
+                mid = (low + high + 1) // 2
+                if measure(title, _load_font(TITLE_FONT_PATH, mid)) <= max_text_width:
+                    low = mid
+                else:
+                    high = mid - 1
+            font = _load_font(TITLE_FONT_PATH, low)
+
+    # Check if text fits at the chosen size
+    text_width = measure(title, font)
+
+    # If still too long, truncate with ellipsis
+    display_title = title
+    if text_width > max_text_width and len(title) > 10:
+        # Binary-search the longest prefix that fits with "..." appended,
+        # never cutting below 7 characters (10 with the ellipsis)
+        low, high = 7, len(title) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if measure(title[:mid].rstrip() + "...", font) <= max_text_width:
+                low = mid
+            else:
+                high = mid - 1
+        display_title = title[:low].rstrip() + "..."
+
+    # Center the final text; the bar is the text height plus padding
+    bbox = draw.textbbox((0, 0), display_title, font=font)
+    text_x = (width - (bbox[2] - bbox[0])) // 2
+    bar_height = (bbox[3] - bbox[1]) + (TITLE_PADDING * 2)
+    return display_title, font, text_x, bar_height
+
+
+def _read_capped(resp, max_bytes):
+    """Reads a streamed response body, stopping once max_bytes have arrived."""
+    body = bytearray()
+    for chunk in resp.iter_content(FEED_CHUNK_BYTES):
+        body.extend(chunk)
+        if len(body) >= max_bytes:
+            logger.debug(f"Feed {resp.url} truncated at {len(body)} bytes")
+            break
+    return bytes(body)
+
+
+def _local_name(tag):
+    """Strips the '{namespace}' prefix ElementTree puts on namespaced tags."""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ""
+
+
+def _extract_titles(xml_bytes, limit=FEED_TITLE_LIMIT):
+    """Returns up to limit headline titles from RSS <item> or Atom <entry> elements.
+
+    Parses incrementally and stops once limit titles are found. Malformed or
+    truncated XML ends the scan, keeping the titles read up to that point.
+    """
+    titles = []
+    try:
+        for _event, elem in ET.iterparse(BytesIO(xml_bytes), events=("end",)):
+            if _local_name(elem.tag) not in ("item", "entry"):
+                continue
+            for child in elem:
+                if _local_name(child.tag) == "title":
+                    title = "".join(child.itertext()).strip()
+                    if title:
+                        titles.append(html.unescape(title))
+                    break
+            # Items are done with once read; keep memory flat on long feeds
+            elem.clear()
+            if len(titles) >= limit:
+                break
+    except ET.ParseError:
+        pass
+    return titles
+
 
 class AIImage(BasePlugin):
     def generate_settings_template(self):
@@ -99,61 +258,24 @@ class AIImage(BasePlugin):
         return image
 
     def _add_title_overlay(self, image: Image.Image, title: str) -> Image.Image:
-        """Add title text overlay at the bottom of the image using full width."""
-        img_with_overlay = image.copy()
-        draw = ImageDraw.Draw(img_with_overlay, 'RGBA')
+        """Add title text overlay at the bottom of the image using full width.
 
-        width, height = img_with_overlay.size
-        padding = 10
-        max_text_width = width - (padding * 2)
+        Draws on image in place and returns it; generate_image owns the resized image.
+        """
+        img_with_overlay = image
 
-        # Start with a reasonable font size and scale down if needed
-        font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
-        target_font_size = max(14, int(height * 0.03))
+        width, height = img_with_overlay.size
+        display_title, font, text_x, bar_height = _layout_title(title, width, height)
 
-        try:
-            font = ImageFont.truetype(font_path, target_font_size)
-        except Exception:
-            font = ImageFont.load_default()
-            target_font_size = 12
-
-        # Check if text fits, reduce font size if needed
-        bbox = draw.textbbox((0, 0), title, font=font)
-        text_width = bbox[2] - bbox[0]
-
-        while text_width > max_text_width and target_font_size > 10:
-            target_font_size -= 1
-            try:
-                font = ImageFont.truetype(font_path, target_font_size)
-            except Exception:
-                break
-            bbox = draw.textbbox((0, 0), title, font=font)
-            text_width = bbox[2] - bbox[0]
-
-        # If still too long, truncate with ellipsis
-        display_title = title
-        if text_width > max_text_width:
-            while text_width > max_text_width and len(display_title) > 10:
-                display_title = display_title[:-4] + "..."
-                bbox = draw.textbbox((0, 0), display_title, font=font)
-                text_width = bbox[2] - bbox[0]
-
-        # Get final text dimensions
-        bbox = draw.textbbox((0, 0), display_title, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        # Draw full-width semi-transparent background bar
-        bar_height = text_height + (padding * 2)
+        # Blend a full-width semi-transparent bar over the bottom strip only;
+        # the bar is its own paste mask
         bar_top = height - bar_height
-        draw.rectangle([0, bar_top, width, height], fill=(0, 0, 0, 180))
-
-        # Center text in the bar
-        x = (width - text_width) // 2
-        y = bar_top + padding
+        bar = Image.new('RGBA', (width, bar_height), TITLE_BAR_COLOR)
+        img_with_overlay.paste(bar, (0, bar_top), bar)
 
-        # Draw text
-        draw.text((x, y), display_title, font=font, fill=(255, 255, 255, 255))
+        # Draw opaque text centered in the bar
+        draw = ImageDraw.Draw(img_with_overlay)
+        draw.text((text_x, bar_top + TITLE_PADDING), display_title, font=font, fill=(255, 255, 255))
 
         return img_with_overlay
 
@@ -177,22 +299,14 @@ class AIImage(BasePlugin):
 
     def _fetch_news_headline(self, feed_urls):
         """Fetch headlines from RSS feeds and return a random one."""
-        session = get_http_session()
         all_headlines = []
-
-        for url in feed_urls:
-            try:
-                resp = session.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-                resp.raise_for_status()
-                import feedparser
-                feed = feedparser.parse(resp.content)
-                for entry in feed.entries:
-                    title = entry.get("title", "").strip()
-                    if title:
-                        all_headlines.append(html.unescape(title))
-            except Exception as e:
-                logger.warning(f"Failed to fetch RSS feed {url}: {e}")
-                continue
+        if len(feed_urls) == 1:
+            all_headlines.extend(self._fetch_feed_headlines(feed_urls[0]))
+        else:
+            # Feeds are fetched concurrently; map() keeps the results in feed order
+            with ThreadPoolExecutor(max_workers=min(MAX_FEED_FETCH_WORKERS, len(feed_urls))) as executor:
+                for headlines in executor.map(self._fetch_feed_headlines, feed_urls):
+                    all_headlines.extend(headlines)
 
         if not all_headlines:
             raise RuntimeError("Could not fetch any news headlines. Check feed URLs and network connectivity.")
@@ -201,6 +315,38 @@ class AIImage(BasePlugin):
         logger.info(f"Selected headline from {len(all_headlines)} total: '{headline}'")
         return headline
 
+    def _fetch_feed_headlines(self, url):
+        """Fetch one RSS feed and return its headlines; failures are logged, not raised."""
+        headlines = []
+        headers = {"User-Agent": "Mozilla/5.0"}
+        # Revalidate a previously parsed feed; a 304 reuses its headlines unparsed
+        with _feed_cache_lock:
+            cached = _feed_cache.get(url)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            with get_http_session().get(url, timeout=10, headers=headers, stream=True) as resp:
+                if resp.status_code == 304 and cached:
+                    return list(cached["headlines"])
+                resp.raise_for_status()
+                content = _read_capped(resp, MAX_FEED_BYTES)
+            headlines = _extract_titles(content)
+            if not headlines:
+                # Not well-formed RSS/Atom; feedparser copes with far messier input
+                import feedparser
+                feed = feedparser.parse(content)
+                for entry in feed.entries:
+                    title = entry.get("title", "").strip()
+                    if title:
+                        headlines.append(html.unescape(title))
+            _store_feed_headlines(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), headlines)
+        except Exception as e:
+            logger.warning(f"Failed to fetch RSS feed {url}: {e}")
+        return headlines
+
     def _generate_with_openai(self, settings, device_config, text_prompt, randomize_prompt, orientation, is_news=False):
         """Generate image using OpenAI DALL-E."""
         api_key = device_config.load_env_key("OPEN_AI_SECRET")
@@ -208,8 +354,8 @@ class AIImage(BasePlugin):
             logger.error("OpenAI API Key not configured")
             raise RuntimeError("OpenAI API Key not configured. Add OPEN_AI_SECRET in Settings > API Keys.")
 
-        # Sanitize API key to ASCII (fixes copy/paste issues with special characters)
-        api_key = api_key.encode('ascii', errors='ignore').decode('ascii').strip()
+        # Sanitize API key to ASCII
+        api_key = _sanitize_api_key(api_key)
 
         image_model = settings.get('imageModel', DEFAULT_OPENAI_MODEL)
         if image_model not in OPENAI_IMAGE_MODELS:
@@ -221,7 +367,7 @@ class AIImage(BasePlugin):
         logger.info(f"OpenAI Settings: model={image_model}, quality={image_quality}")
 
         try:
-            ai_client = OpenAI(api_key=api_key)
+            ai_client = _get_openai_client(api_key)
 
             if randomize_prompt:
                 logger.debug("Generating randomized prompt using GPT-4...")
@@ -245,16 +391,14 @@ class AIImage(BasePlugin):
             raise RuntimeError("Google Gemini API Key not configured. Add GOOGLE_GEMINI_SECRET in Settings > API Keys.")
 
         # Sanitize API key
-        api_key = api_key.encode('ascii', errors='ignore').decode('ascii').strip()
+        api_key = _sanitize_api_key(api_key)
 
         image_model = settings.get('geminiImageModel', DEFAULT_GEMINI_MODEL)
 
         logger.info(f"Gemini Settings: model={image_model}")
 
         try:
-            from google import genai
-
-            client = genai.Client(api_key=api_key)
+            client = _get_gemini_client(api_key)
 
             if randomize_prompt:
                 logger.debug("Generating randomized prompt using Gemini...")
@@ -343,9 +487,10 @@ class AIImage(BasePlugin):
         response = ai_client.images.generate(**args)
         if model in ["dall-e-3", "dall-e-2"]:
             image_url = response.data[0].url
-            session = get_http_session()
-            response = session.get(image_url)
-            img = Image.open(BytesIO(response.content))
+            # Fail on an error page instead of handing it to PIL, and don't hang on a stalled download
+            image_response = get_http_session().get(image_url, timeout=30)
+            image_response.raise_for_status()
+            img = Image.open(BytesIO(image_response.content))
         elif model == "gpt-image-1":
             image_base64 = response.data[0].b64_json
             image_bytes = base64.b64decode(image_base64)
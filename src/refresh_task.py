@@ -63,6 +63,9 @@ class RefreshTask:
                 self.last_loop_rotation_time = None
         else:
             self.last_loop_rotation_time = None
+        # time.monotonic() reading for last_loop_rotation_time; None until the
+        # first rotation this run, since monotonic time doesn't survive restarts
+        self.last_loop_rotation_monotonic = None
 
         # First run after boot uses a short delay so the display updates quickly
         self.first_run = True
@@ -104,7 +107,7 @@ class RefreshTask:
             self.thread.join()
         # Write config on shutdown to persist final state
         logger.info("Writing final config on shutdown")
-        self.device_config.write_config()
+        self.device_config.flush_config()
 
     def _run(self):
         """Background task that manages the periodic refresh of the display.
@@ -195,6 +198,7 @@ class RefreshTask:
 
                     latest_refresh = self.device_config.get_refresh_info()
                     current_dt = self._get_current_datetime()
+                    current_monotonic = time.monotonic()
 
                     refresh_action = None
                     if self.manual_update_request:
@@ -368,6 +372,7 @@ class RefreshTask:
                         # not auto-refresh cycles that shouldn't reset it.
                         if isinstance(refresh_action, LoopRefresh):
                             self.last_loop_rotation_time = current_dt
+                            self.last_loop_rotation_monotonic = current_monotonic
 
                         # Track plugin settings for auto-refresh
                         plugin_settings = getattr(refresh_action, 'plugin_settings', None)
@@ -480,8 +485,7 @@ class RefreshTask:
 
     def _get_display_name(self, plugin_id):
         """Get the human-readable display name for a plugin ID."""
-        cfg = self.device_config.get_plugin(plugin_id)
-        return cfg.get("display_name", plugin_id) if cfg else plugin_id
+        return self.device_config.get_plugin_display_name(plugin_id)
 
     def _set_global_status(self, stage, detail="", plugin_name="", plugin_id=""):
         """Write current refresh status to a JSON file for the loops page to poll.
@@ -492,7 +496,7 @@ class RefreshTask:
             # Check if this plugin has its own status.json for granular stages
             has_plugin_status = False
             if plugin_id:
-                plugin_status_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins", plugin_id, "status.json")
+                plugin_status_path = os.path.join(PLUGINS_DIR, plugin_id, "status.json")
                 has_plugin_status = os.path.exists(plugin_status_path)
 
             status = {
@@ -834,14 +838,18 @@ class LoopRefresh(RefreshAction):
             self.plugin_reference.latest_refresh_time = current_dt.isoformat()
         else:
             logger.info(f"Plugin data still fresh, using cached image. | plugin_id: {self.plugin_reference.plugin_id}")
-            # Load the existing image from disk if it exists (check legacy .png too)
+            # Load the existing image from disk if it exists (check legacy .png too).
+            # Opening directly avoids separate exists() stats before the open.
+            image = None
             legacy_png = plugin_image_path.replace(".jpg", ".png")
-            if not os.path.exists(plugin_image_path) and os.path.exists(legacy_png):
-                plugin_image_path = legacy_png
-            if os.path.exists(plugin_image_path):
-                with Image.open(plugin_image_path) as img:
-                    image = img.copy()
-            else:
+            for cached_path in (plugin_image_path, legacy_png):
+                try:
+                    with Image.open(cached_path) as img:
+                        image = img.copy()
+                    break
+                except FileNotFoundError:
+                    continue
+            if image is None:
                 # First time displaying this plugin, generate new image
                 logger.info(f"No cached image found, generating new image. | plugin_id: {self.plugin_reference.plugin_id}")
                 image = plugin.generate_image(self.plugin_reference.plugin_settings, device_config)
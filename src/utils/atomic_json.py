@@ -0,0 +1,61 @@
+"""
+Atomic JSON file writes for InkyPi
+
+Writes JSON to a temp file in the target directory, fsyncs it, renames it over
+the destination and fsyncs the parent directory, so a power loss mid-write
+leaves either the old file or the new one - never a truncated mix.
+
+Usage:
+    from utils.atomic_json import atomic_write_json
+
+    atomic_write_json(path, config, indent=True)
+    atomic_write_bytes(path, data)  # already-serialized content
+"""
+
+import os
+import tempfile
+from utils.json_utils import json_dumps
+
+
+def atomic_write_json(path, obj, indent=False):
+    """Serialize obj as JSON and atomically replace the file at path.
+
+    Args:
+        path: Destination file path.
+        obj: JSON-serializable object.
+        indent: If True, pretty-print the JSON.
+    """
+    atomic_write_bytes(path, json_dumps(obj, indent=indent))
+
+
+def atomic_write_bytes(path, data):
+    """Atomically replace the file at path with data (bytes)."""
+    path = os.fspath(path)
+    dir_name = os.path.dirname(path) or "."
+    with tempfile.NamedTemporaryFile(mode='wb', dir=dir_name,
+                                     suffix='.tmp', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+        try:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_path)
+            raise
+
+    # Atomic rename (on POSIX systems)
+    os.replace(tmp_path, path)
+    _fsync_dir(dir_name)
+
+
+def _fsync_dir(dir_name):
+    """Flush the directory entry so the rename survives a power loss."""
+    try:
+        dir_fd = os.open(dir_name, os.O_DIRECTORY)
+    except (AttributeError, OSError):
+        return  # O_DIRECTORY is not available on every platform
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
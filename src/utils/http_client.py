@@ -18,12 +18,17 @@ Usage:
 import requests
 import logging
 from typing import Optional
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 # Global session instance (singleton)
 _HTTP_SESSION: Optional[requests.Session] = None
 
+# Geocoding is queried interactively (city search as the user types), so it gets
+# its own pool and a short backoff retry on transient gateway errors
+GEOCODING_BASE_URL = 'https://geocoding-api.open-meteo.com'
+
 
 def get_http_session() -> requests.Session:
     """
@@ -54,6 +59,16 @@ def get_http_session() -> requests.Session:
         _HTTP_SESSION.mount('http://', adapter)
         _HTTP_SESSION.mount('https://', adapter)
 
+        # Longest prefix wins, so this overrides the generic https:// adapter
+        geocoding_adapter = requests.adapters.HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                              raise_on_status=False),
+            pool_block=False
+        )
+        _HTTP_SESSION.mount(GEOCODING_BASE_URL, geocoding_adapter)
+
         logger.debug("HTTP session initialized successfully")
 
     return _HTTP_SESSION
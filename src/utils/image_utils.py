@@ -10,6 +10,9 @@ from utils.http_client import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# Thumbnail size sampled by compute_image_hash
+IMAGE_HASH_SIZE = (100, 60)
+
 def get_image(image_url):
     """Download image from URL using shared HTTP session with connection pooling."""
     session = get_http_session()
@@ -95,10 +98,10 @@ def compute_image_hash(image):
 
     Uses a small thumbnail + Adler-32 for speed. Downsampling to 100x60
     is sufficient to detect content changes while being ~160x faster than
-    hashing the full image.
+    hashing the full image. resize() samples the source directly, so the
+    full-size frame is never copied.
     """
-    thumb = image.copy()
-    thumb.thumbnail((100, 60), Image.NEAREST)
+    thumb = image.resize(IMAGE_HASH_SIZE, Image.NEAREST)
     if thumb.mode != "RGB":
         thumb = thumb.convert("RGB")
     return format(zlib.adler32(thumb.tobytes()) & 0xffffffff, '08x')
@@ -0,0 +1,67 @@
+"""
+Flask JSON provider backed by orjson
+
+Install with `app.json = OrjsonProvider(app)` so jsonify() and the tojson
+template filter use orjson. Flask's own indent/separators/sort_keys arguments
+are mapped to orjson options; any other stdlib-specific argument falls back to
+Flask's default provider.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+from utils.json_utils import ORJSON_AVAILABLE
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+    # Datetimes go through default() so they keep Flask's HTTP date format
+    _BASE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Separators orjson always uses
+_COMPACT_SEPARATORS = (",", ":")
+# dumps() arguments that map onto orjson options; jsonify passes indent or
+# separators, and the tojson filter passes sort_keys
+_ORJSON_KWARGS = frozenset({"indent", "separators", "sort_keys"})
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that encodes and decodes with orjson when possible."""
+
+    def _orjson_option(self, kwargs):
+        """Returns orjson options equivalent to the dumps() kwargs, or None if orjson can't honor them."""
+        if not ORJSON_AVAILABLE:
+            return None
+        indent = kwargs.get("indent")
+        separators = kwargs.get("separators")
+        if set(kwargs) - _ORJSON_KWARGS or indent not in (None, 2) \
+                or separators not in (None, _COMPACT_SEPARATORS):
+            return None
+        option = _BASE_OPTIONS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _orjson_dumps(self, obj, option):
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        option = self._orjson_option(kwargs)
+        if option is None:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj, option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs or not ORJSON_AVAILABLE:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serializes jsonify() data straight to bytes, skipping the str round trip."""
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Pretty-print under the same conditions as DefaultJSONProvider.response()
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._orjson_option({"indent": 2} if pretty else {})
+        return self._app.response_class(self._orjson_dumps(obj, option) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,45 @@
+"""
+Fast JSON encoding/decoding for InkyPi
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise, so callers don't need to care which one is available.
+
+Usage:
+    from utils.json_utils import json_loads, json_dumps
+
+    config = json_loads(f.read())
+    f.write(json_dumps(config, indent=True))
+"""
+
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj, indent=False):
+    """Serialize obj to UTF-8 encoded JSON bytes.
+
+    Args:
+        obj: JSON-serializable object.
+        indent: If True, pretty-print with two-space indentation.
+    """
+    if ORJSON_AVAILABLE:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
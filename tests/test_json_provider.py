@@ -0,0 +1,95 @@
+from unittest import mock
+
+import pytest
+
+flask = pytest.importorskip("flask")
+orjson = pytest.importorskip("orjson")
+
+from utils import json_provider  # noqa: E402
+from utils.json_provider import OrjsonProvider  # noqa: E402
+
+
+def make_app():
+    app = flask.Flask(__name__)
+    app.json = OrjsonProvider(app)
+    return app
+
+
+class TestOrjsonProvider:
+
+    def test_jsonify_uses_orjson(self):
+        app = make_app()
+        with app.app_context():
+            with mock.patch.object(json_provider.orjson, "dumps", wraps=orjson.dumps) as dumps:
+                response = flask.jsonify({"success": True, "count": 2})
+        assert dumps.called
+        assert response.mimetype == "application/json"
+        assert response.get_json() == {"success": True, "count": 2}
+
+    def test_jsonify_pretty_prints_in_debug(self):
+        app = make_app()
+        app.debug = True
+        with app.app_context():
+            body = flask.jsonify({"b": 1, "a": 2}).get_data(as_text=True)
+        assert body == '{\n  "a": 2,\n  "b": 1\n}\n'
+
+    def test_dumps_keeps_flask_date_format(self):
+        from datetime import datetime, timezone
+        app = make_app()
+        with app.app_context():
+            data = flask.json.loads(flask.json.dumps({"at": datetime(2026, 1, 1, tzinfo=timezone.utc)}))
+        assert data == {"at": "Thu, 01 Jan 2026 00:00:00 GMT"}
+
+    def test_unsupported_kwargs_fall_back(self):
+        app = make_app()
+        with app.app_context():
+            assert app.json.dumps({"a": 1}, indent=4) == '{\n    "a": 1\n}'
+
+
+class TestBlueprintResponses:
+
+    def make_client(self):
+        pytest.importorskip("pytz")
+        from blueprints.settings import settings_bp
+
+        app = make_app()
+        app.config["DEVICE_CONFIG"] = mock.Mock()
+        app.register_blueprint(settings_bp)
+        return app, app.test_client()
+
+    def test_settings_responses_use_orjson(self):
+        app, client = self.make_client()
+        form = {"timezoneName": "UTC", "timeFormat": "24h", "orientation": "horizontal"}
+        with mock.patch.object(json_provider.orjson, "dumps", wraps=orjson.dumps) as dumps:
+            saved = client.post("/save_settings", data=form)
+            rejected = client.post("/save_settings", data={"timeFormat": "24h"})
+        assert dumps.call_count == 2
+        assert saved.get_json() == {"success": True, "message": "Saved settings."}
+        assert rejected.status_code == 400
+        assert rejected.get_json() == {"error": "Time Zone is required"}
+        app.config["DEVICE_CONFIG"].update_config.assert_called_once()
+
+    def test_update_check_reports_placeholder_without_version_file(self, tmp_path, monkeypatch):
+        from blueprints import settings
+
+        app, client = self.make_client()
+        monkeypatch.setattr(settings, "VERSION_FILE", str(tmp_path / "VERSION"))
+        settings._get_version.cache_clear()
+        failed_fetch = mock.Mock(returncode=1, stderr="offline")
+        with mock.patch.object(settings.subprocess, "run", return_value=failed_fetch):
+            response = client.get("/api/update/check")
+        settings._get_version.cache_clear()
+        assert response.status_code == 500
+        assert response.get_json()["local_version"] == "?"
+
+
+class TestTemplateFilter:
+
+    def test_tojson_filter_uses_orjson(self):
+        app = make_app()
+        with app.app_context():
+            with mock.patch.object(json_provider.orjson, "dumps", wraps=orjson.dumps) as dumps:
+                rendered = flask.render_template_string("{{ x|tojson }}", x={"b": "<i>", "a": 1})
+        assert dumps.called
+        assert dumps.call_args.kwargs["option"] & orjson.OPT_SORT_KEYS
+        assert rendered == '{"a":1,"b":"\\u003ci\\u003e"}'
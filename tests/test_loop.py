@@ -0,0 +1,190 @@
+from datetime import datetime
+
+import pytest
+
+from model import Loop, LoopManager
+
+
+class TestLoopPlugins:
+
+    def make_loop(self):
+        return Loop("Test Loop", "00:00", "24:00", plugin_order=[
+            {"plugin_id": "clock", "refresh_interval_seconds": 60},
+            {"plugin_id": "weather", "refresh_interval_seconds": 1800},
+        ])
+
+    def test_get_plugin_ref(self):
+        loop = self.make_loop()
+        assert loop.get_plugin_ref("weather").refresh_interval_seconds == 1800
+        assert loop.get_plugin_ref("missing") is None
+
+    def test_add_plugin_with_settings(self):
+        loop = self.make_loop()
+        assert loop.add_plugin("rss", 900, {"feedUrl": "https://example.com/feed"})
+        assert loop.get_plugin_ref("rss").plugin_settings == {"feedUrl": "https://example.com/feed"}
+        assert not loop.add_plugin("rss", 900)
+
+    def test_remove_plugin(self):
+        loop = self.make_loop()
+        assert loop.remove_plugin("clock")
+        assert loop.get_plugin_ref("clock") is None
+        assert [ref.plugin_id for ref in loop.plugin_order] == ["weather"]
+        assert not loop.remove_plugin("clock")
+
+    def test_reorder_plugins_drops_unknown(self):
+        loop = self.make_loop()
+        loop.reorder_plugins(["weather", "unknown", "clock"])
+        assert [ref.plugin_id for ref in loop.plugin_order] == ["weather", "clock"]
+        loop.reorder_plugins(["weather"])
+        assert loop.get_plugin_ref("clock") is None
+
+    def test_randomize_never_repeats_current(self):
+        loop = self.make_loop()
+        loop.add_plugin("rss", 900)
+        loop.randomize = True
+        seen = set()
+        for _ in range(200):
+            loop.current_plugin_index = 1
+            loop._compute_next_plugin_index()
+            seen.add(loop.next_plugin_index)
+        assert seen == {0, 2}
+
+
+class TestLoopIsActive:
+
+    @pytest.mark.parametrize("start, end, current, expected", [
+        ("09:00", "15:00", "09:00", True),
+        ("09:00", "15:00", "15:00", False),
+        ("00:00", "24:00", "23:59", True),
+        ("21:00", "03:00", "23:30", True),
+        ("21:00", "03:00", "02:59", True),
+        ("21:00", "03:00", "12:00", False),
+    ])
+    def test_is_active(self, start, end, current, expected):
+        hours, minutes = map(int, current.split(":"))
+        assert Loop("Test", start, end).is_active(hours * 60 + minutes) == expected
+
+
+    @pytest.mark.parametrize("start, end, minutes", [
+        ("09:00", "15:00", 360),
+        ("00:00", "24:00", 1440),
+        ("22:00", "24:00", 120),
+        ("21:00", "03:00", 360),
+    ])
+    def test_time_range_minutes(self, start, end, minutes):
+        assert Loop("Test", start, end).get_time_range_minutes() == minutes
+
+class TestLoopManagerActiveLoop:
+
+    def make_manager(self):
+        return LoopManager.from_dict({"loops": [
+            {"name": "Day", "start_time": "00:00", "end_time": "24:00",
+             "plugin_order": [{"plugin_id": "clock", "refresh_interval_seconds": 60}]},
+            {"name": "Morning", "start_time": "06:00", "end_time": "09:00",
+             "plugin_order": [{"plugin_id": "weather", "refresh_interval_seconds": 1800}]},
+        ]})
+
+    def test_smallest_window_wins(self):
+        manager = self.make_manager()
+        assert manager.determine_active_loop(datetime(2026, 1, 1, 7, 30)).name == "Morning"
+        assert manager.determine_active_loop(datetime(2026, 1, 1, 12, 0)).name == "Day"
+
+    def test_cache_invalidated_by_loop_edits(self):
+        manager = self.make_manager()
+        now = datetime(2026, 1, 1, 7, 30)
+        assert manager.determine_active_loop(now).name == "Morning"
+        manager.delete_loop("Morning")
+        assert manager.determine_active_loop(now).name == "Day"
+        manager.update_loop("Day", "Night", "20:00", "06:00")
+        assert manager.determine_active_loop(now) is None
+
+    def test_get_loop_follows_renames_and_deletes(self):
+        manager = self.make_manager()
+        manager.update_loop("Morning", "Breakfast", "06:00", "09:00")
+        assert manager.get_loop("Morning") is None
+        assert manager.get_loop("Breakfast").start_time == "06:00"
+        assert not manager.add_loop("Breakfast", "10:00", "11:00")
+        manager.delete_loop("Breakfast")
+        assert manager.get_loop("Breakfast") is None
+        assert manager.add_loop("Breakfast", "10:00", "11:00")
+
+    def test_direct_attribute_changes_invalidate(self):
+        manager = self.make_manager()
+        now = datetime(2026, 1, 1, 7, 30)
+        morning = manager.get_loop("Morning")
+        assert manager.determine_active_loop(now) is morning
+        morning.end_time = "07:00"
+        assert morning.get_time_range_minutes() == 60
+        assert manager.determine_active_loop(now).name == "Day"
+        morning.name = "Dawn"
+        assert manager.get_loop("Dawn") is morning
+
+    def test_cache_skips_loop_emptied_of_plugins(self):
+        manager = self.make_manager()
+        now = datetime(2026, 1, 1, 7, 30)
+        assert manager.determine_active_loop(now).name == "Morning"
+        manager.get_loop("Morning").remove_plugin("weather")
+        assert manager.determine_active_loop(now).name == "Day"
+
+    def test_plugin_added_to_empty_loop_becomes_active(self):
+        manager = self.make_manager()
+        now = datetime(2026, 1, 1, 7, 30)
+        manager.get_loop("Morning").remove_plugin("weather")
+        assert manager.determine_active_loop(now).name == "Day"
+        version = manager._loops_version
+        assert manager.get_loop("Morning").add_plugin("clock", 60)
+        assert manager._loops_version > version
+        assert [loop.name for loop in manager._get_loops_by_priority()] == ["Morning", "Day"]
+        assert manager.determine_active_loop(now).name == "Morning"
+
+
+class TestToDictCache:
+
+    def make_manager(self):
+        return LoopManager.from_dict({"loops": [
+            {"name": "Day", "start_time": "00:00", "end_time": "24:00",
+             "plugin_order": [{"plugin_id": "clock", "refresh_interval_seconds": 60}]},
+        ]})
+
+    def test_unchanged_manager_reuses_dict(self):
+        manager = self.make_manager()
+        assert manager.to_dict() is manager.to_dict()
+
+    def test_plugin_reference_change_invalidates_parents(self):
+        manager = self.make_manager()
+        before = manager.to_dict()
+        manager.get_loop("Day").get_plugin_ref("clock").latest_refresh_time = "2026-01-01T00:00:00"
+        after = manager.to_dict()
+        assert after is not before
+        assert after["loops"][0]["plugin_order"][0]["latest_refresh_time"] == "2026-01-01T00:00:00"
+
+    def test_list_mutations_invalidate(self):
+        manager = self.make_manager()
+        manager.to_dict()
+        manager.get_loop("Day").add_plugin("weather", 1800)
+        assert len(manager.to_dict()["loops"][0]["plugin_order"]) == 2
+        manager.add_loop("Night", "20:00", "06:00")
+        assert [loop["name"] for loop in manager.to_dict()["loops"]] == ["Day", "Night"]
+        manager.rotation_interval_seconds = 60
+        assert manager.to_dict()["rotation_interval_seconds"] == 60
+
+    def test_weather_location_follows_settings_changes(self):
+        manager = self.make_manager()
+        assert manager.get_weather_location() == (None, None)
+        loop = manager.get_loop("Day")
+        loop.add_plugin("weather", 1800, {"latitude": 40.7, "longitude": -74.0})
+        assert manager.get_weather_location() == (40.7, -74.0)
+        loop.get_plugin_ref("weather").plugin_settings = {"latitude": 51.5, "longitude": -0.1}
+        assert manager.get_weather_location() == (51.5, -0.1)
+        loop.remove_plugin("weather")
+        assert manager.get_weather_location() == (None, None)
+
+    def test_latest_refresh_dt_follows_updates(self):
+        ref = self.make_manager().get_loop("Day").get_plugin_ref("clock")
+        assert ref.get_latest_refresh_dt() is None
+        ref.latest_refresh_time = "2026-01-01T00:00:00"
+        first = ref.get_latest_refresh_dt()
+        assert first == datetime(2026, 1, 1)
+        assert ref.get_latest_refresh_dt() is first
+        ref.latest_refresh_time = "2026-01-01T00:05:00"
+        assert ref.get_latest_refresh_dt() == datetime(2026, 1, 1, 0, 5)
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("psutil")
+pytest.importorskip("PIL")
+
+from blueprints import main  # noqa: E402
+
+
+class TestFormatTime:
+
+    @pytest.mark.parametrize("seconds, expected", [
+        (0, "0s"),
+        (59, "59s"),
+        (59.5, "59.5s"),
+        (61, "1m 1s"),
+        (3720, "1h 2m"),
+    ])
+    def test_format_time(self, seconds, expected):
+        assert main.format_time(seconds) == expected
+
+
+class TestCurrentImage:
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        import flask
+
+        (tmp_path / "current_image.png").write_bytes(b"png")
+        monkeypatch.setattr(main, "IMAGES_DIR", str(tmp_path))
+        monkeypatch.setattr(main, "CURRENT_IMAGE_PATH", str(tmp_path / "current_image.png"))
+        monkeypatch.setattr(main, "_current_image_stat", (float("-inf"), None))
+        app = flask.Flask(__name__)
+        app.register_blueprint(main.main_bp)
+        return app.test_client()
+
+    def test_unchanged_poll_gets_bare_304(self, client):
+        first = client.get("/api/current_image")
+        assert first.status_code == 200
+        assert first.headers["ETag"]
+
+        poll = client.get("/api/current_image", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+        assert poll.status_code == 304
+        assert poll.headers["Cache-Control"] == "no-cache"
+        assert "Last-Modified" not in poll.headers
+        assert poll.data == b""